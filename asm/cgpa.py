@@ -2,7 +2,8 @@ import tkinter as tk
 from tkinter import messagebox, Listbox, Scrollbar
 from PIL import Image, ImageTk, ImageDraw, ImageFont 
 import os # For file existence checks
-import json # For data persistence
+import datastore # Cached JSON loading shared by all sub-apps
+from watcher import FileWatcher # Picks up saves made by other CGPA windows
 
 # Set a file path for data persistence. This file will be created in the same
 # directory as the script.
@@ -128,6 +129,7 @@ class CalculatorApp:
 
         self.current_Semester_index = 0
         self.selected_course_index = None
+        self.watcher = FileWatcher(master, (DATA_FILE,), self.on_data_changed)
 
         # --- UI LAYOUT IMPROVEMENTS ---
         # Using a grid for a more organized, form-like layout
@@ -291,6 +293,7 @@ class CalculatorApp:
         self.update_Semester_menu()
         self.current_Semester_index = new_index
         self.update_display()
+        self.save_data()
         
     def clear_input_fields(self):
         self.course_name_entry.delete(0, tk.END)
@@ -322,6 +325,7 @@ class CalculatorApp:
             
         self.update_display()
         self.clear_input_fields()
+        self.save_data()
 
     def update_course(self, new_course_name, new_grade, new_credit_hours):
         """
@@ -362,6 +366,7 @@ class CalculatorApp:
             messagebox.showinfo("Success", f"'{course_name}' has been deleted.")
             self.update_display()
             self.clear_input_fields()
+            self.save_data()
     
     def edit_course(self):
         """
@@ -466,28 +471,39 @@ class CalculatorApp:
         Loads the Semesters data from a JSON file if it exists.
         """
         if os.path.exists(DATA_FILE):
-            try:
-                with open(DATA_FILE, 'r') as file:
-                    loaded_data = json.load(file)
-                    # Check if the loaded data has the correct structure before using it
-                    if isinstance(loaded_data, list) and all(isinstance(t, list) for t in loaded_data):
-                        self.Semesters_data = loaded_data
-                        # Ensure we have at least one Semester list, even if it's empty
-                        if not self.Semesters_data:
-                            self.Semesters_data.append([])
-                        self.current_Semester_index = 0
-                    else:
-                        print("Warning: Data file content is not in the expected format. Starting with empty data.")
-            except json.JSONDecodeError:
-                print("Warning: Could not decode JSON from file. File might be corrupted. Starting with empty data.")
+            loaded_data = datastore.load_json(DATA_FILE, default=lambda: None)
+            # Check if the loaded data has the correct structure before using it
+            if isinstance(loaded_data, list) and all(isinstance(t, list) for t in loaded_data):
+                # Copy: the parsed document is shared through the datastore cache
+                self.Semesters_data = [[dict(c) for c in t] for t in loaded_data]
+                # Ensure we have at least one Semester list, even if it's empty
+                if not self.Semesters_data:
+                    self.Semesters_data.append([])
+                self.current_Semester_index = 0
+            else:
+                print("Warning: Could not read the data file or it is not in the expected format. Starting with empty data.")
             
+    def on_data_changed(self, paths):
+        """
+        Another window saved the data file: show its version, staying on the
+        same Semester. Every change here is saved right away, so nothing is lost;
+        a course being edited is left alone until it is saved or cancelled.
+        """
+        if self.selected_course_index is not None:
+            self.watcher.retry(paths)
+            return
+        current = self.current_Semester_index
+        self.load_data()
+        self.current_Semester_index = min(current, len(self.Semesters_data) - 1)
+        self.update_Semester_menu()
+        self.update_display()
+
     def save_data(self):
         """
         Saves the current Semesters data to a JSON file.
         """
         try:
-            with open(DATA_FILE, 'w') as file:
-                json.dump(self.Semesters_data, file, indent=4)
+            datastore.save_json(DATA_FILE, self.Semesters_data, indent=4)
         except IOError:
             messagebox.showerror("Save Error", "Could not save data to file. Check file permissions.")
     
@@ -0,0 +1,78 @@
+"""Shared, cached access to the app's JSON files.
+
+Parsed documents are kept in memory together with the file's
+(mtime, size). A later load only costs an os.stat() unless another
+process (or window) changed the file, in which case it is re-parsed.
+
+Documents returned by load_json() are shared with the cache: treat them
+as read-only and build new lists/dicts before saving changes.
+"""
+import json
+import os
+
+_cache = {}  # path -> (stamp, document)
+_stats = {}  # path -> {"hits": n, "misses": n}
+
+
+def file_stamp(path):
+    """Cheap change detector: (mtime_ns, size), or None if the file is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def count(path, kind):
+    counters = _stats.setdefault(os.path.abspath(path), {"hits": 0, "misses": 0})
+    counters[kind] += 1
+
+
+def load_json(path, default=list):
+    """Return the parsed JSON in `path`, or default() if it is missing, empty or corrupt."""
+    key = os.path.abspath(path)
+    stamp = file_stamp(path)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        count(path, "hits")
+        return cached[1]
+    count(path, "misses")
+    data = default()
+    if stamp is not None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read().strip()
+            if text:
+                data = json.loads(text)
+        except (OSError, ValueError):
+            pass
+    _cache[key] = (stamp, data)
+    return data
+
+
+def save_json(path, data, indent=2):
+    """Write atomically and keep the cache in step, so our own write is not re-read.
+
+    The cache gets its own copy (parsed back from the text just written), so
+    the caller may keep modifying `data` afterwards.
+    """
+    text = json.dumps(data, indent=indent)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+    _cache[os.path.abspath(path)] = (file_stamp(path), json.loads(text))
+
+
+def invalidate(path=None):
+    if path is None:
+        _cache.clear()
+    else:
+        _cache.pop(os.path.abspath(path), None)
+
+
+def cache_stats():
+    """{path: {"hits": n, "misses": n}} plus a "total" entry."""
+    stats = {path: dict(c) for path, c in _stats.items()}
+    stats["total"] = {kind: sum(c[kind] for c in _stats.values()) for kind in ("hits", "misses")}
+    return stats
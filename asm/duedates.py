@@ -0,0 +1,73 @@
+"""Due dates as day ordinals, and the overdue/today classification.
+
+Tasks keep their due date as "YYYY-MM-DD" text in "due_at". The task
+store also records it as a date ordinal in "due_ord" when the task is
+written (or loaded without one), so the planner never parses dates while
+refreshing. Classifying a list is then one pass of integer comparisons
+against a single "today", done with NumPy when it is installed.
+"""
+import re
+from datetime import date, datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # optional; the plain loop gives the same result
+    np = None
+
+# Exactly what strftime("%Y-%m-%d") writes: date.fromisoformat alone also
+# takes "20301231" and "2030-W05-3" on Python 3.11+
+DUE_FORMAT = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+
+def due_ordinal(due_at):
+    """date.toordinal() of a "YYYY-MM-DD" string, or None if it is empty or invalid."""
+    if not isinstance(due_at, str) or not DUE_FORMAT.fullmatch(due_at):
+        return None
+    try:
+        return date.fromisoformat(due_at).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def with_due_ord(task):
+    """`task` with an up-to-date "due_ord" (the same dict when it already has one)."""
+    ordinal = due_ordinal(task.get("due_at"))
+    if "due_ord" in task and task["due_ord"] == ordinal:
+        return task
+    return dict(task, due_ord=ordinal)
+
+
+def today_ordinal():
+    return date.today().toordinal()
+
+
+def ms_until_midnight():
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return int((midnight - now).total_seconds() * 1000) + 1000  # land safely past midnight
+
+
+def classify(tasks, today=None):
+    """Row tag per task: "done", "overdue", "today" or "" (due later, or no date)."""
+    today = today_ordinal() if today is None else today
+    if np is not None and len(tasks) > 1000:
+        ords = np.fromiter((t.get("due_ord") or 0 for t in tasks), dtype=np.int64, count=len(tasks))
+        done = np.fromiter((t["status"] == "done" for t in tasks), dtype=bool, count=len(tasks))
+        dated = ords > 0
+        tags = np.select([done, dated & (ords < today), dated & (ords == today)],
+                         ["done", "overdue", "today"], "")
+        return tags.tolist()
+    tags = []
+    for t in tasks:
+        ordinal = t.get("due_ord")
+        if t["status"] == "done":
+            tags.append("done")
+        elif ordinal is None:
+            tags.append("")
+        elif ordinal < today:
+            tags.append("overdue")
+        elif ordinal == today:
+            tags.append("today")
+        else:
+            tags.append("")
+    return tags
@@ -0,0 +1,117 @@
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageOps
+import hashlib
+import json
+import os
+
+# Rendered backgrounds are kept per (width, height, color1, color2) so going
+# back to a size we already drew (e.g. maximise -> restore -> maximise) is free.
+GRADIENT_CACHE_SIZE = 8
+
+# Finished app-card bitmaps are stored here so a warm start skips the resize,
+# corner masking and border work. Bump CARD_RENDER_VERSION whenever the
+# drawing code below changes so old bitmaps are not reused.
+CARD_CACHE_DIR = os.path.join(".cache", "cards")
+CARD_RENDER_VERSION = 1
+
+
+@lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def create_gradient(width, height, color1, color2):
+    """Generate vertical gradient background with Pillow.
+
+    Every row has a single colour, so the blend is done on a 1-pixel-wide
+    column and then stretched to the full width in C. The Python side only
+    touches `height` values instead of width * height.
+    Callers must not modify the returned image, it is shared through the cache.
+    """
+    width, height = max(int(width), 1), max(int(height), 1)
+    mask = Image.frombytes("L", (1, height), bytes(int(255 * (y / height)) for y in range(height)))
+    column = Image.new("RGB", (1, height), color1)
+    column.paste(Image.new("RGB", (1, height), color2), (0, 0), mask)
+    return column.resize((width, height), Image.NEAREST)
+
+
+def create_gradient_loop(width, height, color1, color2):
+    """Original per-pixel implementation, kept as the benchmark baseline."""
+    base = Image.new("RGB", (width, height), color1)
+    top = Image.new("RGB", (width, height), color2)
+    mask = Image.new("L", (width, height))
+    mask_data = []
+    for y in range(height):
+        mask_data.extend([int(255 * (y / height))] * width)
+    mask.putdata(mask_data)
+    base.paste(top, (0, 0), mask)
+    return base
+
+
+# ---------- App card icons ----------
+def create_default_image(text, size=180):
+    img = Image.new('RGB', (size, size), color='#dee2e6')
+    draw = ImageDraw.Draw(img)
+    draw.text((40, 80), text[:4], fill='black')
+    return img
+
+
+def draw_app_card(image_file, text, size=180, radius=30, border=10):
+    """Resize the icon, round its corners and add the white border."""
+    if os.path.exists(image_file):
+        img = Image.open(image_file).resize((size, size), Image.LANCZOS)
+    else:
+        img = create_default_image(text, size)
+
+    img = img.convert("RGBA")
+    circle = Image.new('L', (radius * 2, radius * 2), 0)
+    draw = ImageDraw.Draw(circle)
+    draw.ellipse((0, 0, radius * 2, radius * 2), fill=255)
+    alpha = Image.new('L', img.size, 255)
+    w, h = img.size
+    alpha.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+    alpha.paste(circle.crop((0, radius, radius, radius * 2)), (0, h - radius))
+    alpha.paste(circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0))
+    alpha.paste(circle.crop((radius, radius, radius * 2, radius * 2)), (w - radius, h - radius))
+    img.putalpha(alpha)
+
+    return ImageOps.expand(img, border=border, fill="white")
+
+
+def card_cache_key(image_file, text, size, radius, border):
+    """Hash of everything that affects the finished card bitmap."""
+    h = hashlib.sha256()
+    try:
+        with open(image_file, "rb") as f:
+            h.update(f.read())
+    except OSError:
+        h.update(b"placeholder:" + text.encode())
+    h.update(json.dumps([CARD_RENDER_VERSION, size, radius, border]).encode())
+    return h.hexdigest()[:24]
+
+
+def load_app_card(image_file, text, size=180, radius=30, border=10, cache_dir=None):
+    """Return the finished RGBA card image, from the on-disk cache when possible.
+
+    Entries are named <icon>-<key>.png; when the key changes (icon content or
+    any drawing parameter) the new bitmap replaces all older entries for that icon.
+    """
+    cache_dir = cache_dir or CARD_CACHE_DIR
+    stem = os.path.splitext(os.path.basename(image_file))[0]
+    key = card_cache_key(image_file, text, size, radius, border)
+    cached = os.path.join(cache_dir, f"{stem}-{key}.png")
+    try:
+        img = Image.open(cached)
+        img.load()
+        return img
+    except (OSError, ValueError):
+        pass
+
+    img = draw_app_card(image_file, text, size, radius, border)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for name in os.listdir(cache_dir):
+            if name.startswith(stem + "-") and name.endswith(".png"):
+                os.remove(os.path.join(cache_dir, name))
+        tmp = cached + ".tmp"
+        img.save(tmp, format="PNG", compress_level=1)
+        os.replace(tmp, cached)
+    except OSError:
+        pass  # a read-only folder just means no cache
+    return img
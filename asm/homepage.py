@@ -1,13 +1,49 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk, ImageDraw, ImageOps
-from cgpa import *
-from homeworkPlanner import *
-from reminders import *
+from PIL import ImageTk
 from login import LoginWindow
+from launcher import AppLauncher
+from graphics import create_gradient, load_app_card
 from time import strftime
 
 
+class ResizeScheduler:
+    """Coalesce <Configure> bursts into a single callback(width, height).
+
+    Events from child widgets are dropped, a drag-resize only triggers one
+    redraw once the size has settled for `delay` ms, and nothing is redrawn
+    when the settled size equals the last one drawn.
+    """
+
+    def __init__(self, widget, callback, delay=150):
+        self.widget = widget
+        self.callback = callback
+        self.delay = delay
+        self.last_size = None
+        self.pending_size = None
+        self.after_id = None
+        self.stats = {"ignored": 0, "coalesced": 0, "skipped": 0, "performed": 0}
+
+    def on_configure(self, event):
+        if event.widget is not self.widget:
+            self.stats["ignored"] += 1
+            return
+        self.pending_size = (event.width, event.height)
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.stats["coalesced"] += 1
+        self.after_id = self.widget.after(self.delay, self.flush)
+
+    def flush(self):
+        self.after_id = None
+        if self.pending_size == self.last_size:
+            self.stats["skipped"] += 1
+            return
+        self.last_size = self.pending_size
+        self.stats["performed"] += 1
+        self.callback(*self.last_size)
+
+
 class HomePage:
     def __init__(self, master):
         self.master = master
@@ -23,8 +59,10 @@ class HomePage:
         self.bg_label = tk.Label(master, image=self.bg_photo)
         self.bg_label.place(relwidth=1, relheight=1)
 
-        # Update background when window resizes
-        master.bind("<Configure>", self.resize_background)
+        # Update background when window resizes (debounced, root events only)
+        self.resize_scheduler = ResizeScheduler(master, self.resize_background)
+        self.resize_scheduler.last_size = self.bg_image.size
+        master.bind("<Configure>", self.resize_scheduler.on_configure)
 
         # Header (like a navbar)
         self.header = tk.Label(master, text="✨ Welcome to My TARUMT App ✨",
@@ -43,6 +81,10 @@ class HomePage:
         self.date_label.pack(pady=(0, 30))
         self.update_time()
 
+        # Opens the sub-apps as windows of this process (see launcher.py).
+        # Their modules are only imported when a card is first clicked.
+        self.launcher = AppLauncher(master)
+
         # Button frame (cards container)
         self.button_frame = tk.Frame(master, bg="#74b9ff")
         self.button_frame.pack(expand=True)
@@ -78,9 +120,8 @@ class HomePage:
         self.date_label.config(text=current_date)
         self.clock_label.after(1000, self.update_time)
 
-    def resize_background(self, event):
+    def resize_background(self, w, h):
         """Resize background dynamically when window size changes"""
-        w, h = event.width, event.height
         self.bg_image = self.create_gradient(w, h, "#74b9ff", "#a29bfe")
         self.bg_photo = ImageTk.PhotoImage(self.bg_image)
         self.bg_label.config(image=self.bg_photo)
@@ -93,27 +134,8 @@ class HomePage:
         # Shadow effect
         card.config(highlightbackground="#dfe6e9", highlightthickness=3)
 
-        # Load image or placeholder
-        if self.image_exists(image_file):
-            img = Image.open(image_file).resize((180, 180), Image.LANCZOS)
-        else:
-            img = self.create_default_image(text)
-
-        # Rounded corners
-        img = img.convert("RGBA")
-        radius = 30
-        circle = Image.new('L', (radius * 2, radius * 2), 0)
-        draw = ImageDraw.Draw(circle)
-        draw.ellipse((0, 0, radius * 2, radius * 2), fill=255)
-        alpha = Image.new('L', img.size, 255)
-        w, h = img.size
-        alpha.paste(circle.crop((0, 0, radius, radius)), (0, 0))
-        alpha.paste(circle.crop((0, radius, radius, radius * 2)), (0, h - radius))
-        alpha.paste(circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0))
-        alpha.paste(circle.crop((radius, radius, radius * 2, radius * 2)), (w - radius, h - radius))
-        img.putalpha(alpha)
-
-        img = ImageOps.expand(img, border=10, fill="white")
+        # Icon (or placeholder) with rounded corners and border, pre-rendered on disk
+        img = load_app_card(image_file, text, size=180, radius=30, border=10)
         photo = ImageTk.PhotoImage(img)
 
         btn = tk.Label(card, image=photo, bg="white", cursor="hand2")
@@ -145,39 +167,11 @@ class HomePage:
         label.bind("<Leave>", on_leave)
 
     def create_gradient(self, width, height, color1, color2):
-        """Generate vertical gradient background with Pillow"""
-        base = Image.new("RGB", (width, height), color1)
-        top = Image.new("RGB", (width, height), color2)
-        mask = Image.new("L", (width, height))
-        mask_data = []
-        for y in range(height):
-            mask_data.extend([int(255 * (y / height))] * width)
-        mask.putdata(mask_data)
-        base.paste(top, (0, 0), mask)
-        return base
-
-    def image_exists(self, filename):
-        try:
-            with open(filename, 'rb'):
-                return True
-        except IOError:
-            return False
-
-    def create_default_image(self, text):
-        img = Image.new('RGB', (180, 180), color='#dee2e6')
-        draw = ImageDraw.Draw(img)
-        draw.text((40, 80), text[:4], fill='black')
-        return img
+        """Generate vertical gradient background (vectorised and cached in graphics.py)"""
+        return create_gradient(width, height, color1, color2)
 
     def open_application(self, app_name):
-        import subprocess
-        if app_name == "CGPA & GPA Calculator":
-            subprocess.Popen(["python", "cgpa.py"])
-        elif app_name == "Homework Planner":
-            subprocess.Popen(["python", "homeworkPlanner.py"])
-        elif app_name == "Simple Reminder":
-            subprocess.Popen(["python", "reminders.py"])
-        else:
+        if not self.launcher.open(app_name):
             messagebox.showinfo("Info", f"Opening {app_name}")
 
 
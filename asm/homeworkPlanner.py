@@ -1,12 +1,17 @@
+import atexit
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
+from datetime import date, datetime
 import tkinter.simpledialog as simpledialog
-import json
-import os
+from duedates import classify, due_ordinal, ms_until_midnight, today_ordinal
+from reminderlinks import new_reminder_id
+from taskstore import open_task_store
+from watcher import FileWatcher
+from widgets import VirtualTreeview
+from workers import run_in_background
 
 DATA_FILE = "homework.json"
-REMINDER_FILE = "reminders.json"
+FILTER_DELAY_MS = 150  # typing pause before the task list is re-filtered
 
 # ---------- Global Fonts ----------
 DEFAULT_FONT = ("Arial", 14)
@@ -14,38 +19,18 @@ BOLD_FONT = ("Arial", 14, "bold")
 TITLE_FONT = ("Arial", 16, "bold")
 SMALL_FONT = ("Arial", 12)
 
-# ---------- JSON Helpers ----------
-def load_json(file_path):
-    if not os.path.exists(file_path):
-        return []
-    try:
-        with open(file_path, "r") as f:
-            data = f.read().strip()
-            if not data:
-                return []
-            return json.loads(data)
-    except Exception:
-        return []
-
-def save_json(file_path, data):
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=2)
-
-def load_tasks_from_json():
-    return load_json(DATA_FILE)
-
-def save_tasks_to_json(tasks):
-    save_json(DATA_FILE, tasks)
-
-def load_reminders_from_json():
-    return load_json(REMINDER_FILE)
-
-def save_reminders_to_json(reminders):
-    save_json(REMINDER_FILE, reminders)
-
 class HomeworkPlanner:
-    def __init__(self, root):
+    def __init__(self, root, home_window=None):
         self.root = root
+        self.home_window = home_window
+        self.store = open_task_store(DATA_FILE)
+        self.filter_job = None
+        self.filter_future = None
+        self.filter_generation = 0
+        self.today = today_ordinal()  # overdue/today colours are relative to this; see on_midnight
+        # Saves the search index so the next start can skip rebuilding it
+        self.root.bind("<Destroy>", self.on_destroy, add="+")
+        atexit.register(self.store.close)
         self.root.title("Homework Planner (Enhanced)")
         self.root.configure(bg="#f4f4f9")
         self.root.state("zoomed")
@@ -78,7 +63,10 @@ class HomeworkPlanner:
         self.setup_tasks_tab()
         self.setup_add_tab()
         self.load_tasks()
+        # Tasks changed by another window show up here without a manual refresh
+        self.watcher = FileWatcher(self.root, self.store.watch_paths(), self.on_tasks_changed)
         self.update_clock()
+        self.root.after(ms_until_midnight(), self.on_midnight)
 
         # Footer
         self.footer = tk.Label(self.root, text="✨ TARUMT Student Assistant App ✨",
@@ -97,13 +85,19 @@ class HomeworkPlanner:
         self.clock_label.config(text=now)
         self.root.after(1000, self.update_clock)
 
+    def on_midnight(self):
+        """Yesterday's "today" tasks are overdue now: re-classify once a day instead of on every refresh."""
+        self.today = today_ordinal()
+        self.start_filter()
+        self.root.after(ms_until_midnight(), self.on_midnight)
+
     def show_task_details(self, event=None):
         sel = self.tree.selection()
         if not sel:
             return
         task_id = int(sel[0])
-        tasks = load_tasks_from_json()
-        task = next((t for t in tasks if t["id"] == task_id), None)
+        self.store.refresh()
+        task = self.store.get(task_id)
         if not task:
             return
 
@@ -165,6 +159,12 @@ class HomeworkPlanner:
         self.search_entry = tk.Entry(filter_frame, width=17, font=DEFAULT_FONT)
         self.search_entry.grid(row=2, column=1, sticky="w", padx=10, pady=10)
 
+        # Filter as you type; see schedule_filter
+        self.search_entry.bind("<KeyRelease>", self.schedule_filter)
+        for combo in (self.status_filter, self.subject_filter):
+            combo.bind("<<ComboboxSelected>>", self.schedule_filter)
+            combo.bind("<KeyRelease>", self.schedule_filter)
+
         tk.Button(filter_frame, text="Apply", bg="#4caf50", fg="white", font=DEFAULT_FONT,
                   command=self.load_tasks)\
             .grid(row=3, column=1, columnspan=1,padx=10, pady=10, sticky="w")
@@ -174,32 +174,41 @@ class HomeworkPlanner:
         style.configure("Treeview.Heading", font=BOLD_FONT)
         style.map("Treeview", background=[("selected", "#2196f3")], foreground=[("selected", "white")])
 
-        self.tree = ttk.Treeview(
+        # Only the visible rows exist in Tk, so very large task lists still redraw instantly
+        self.tree = VirtualTreeview(
             self.tab_tasks,
             columns=("Title", "Subject", "Due", "Priority", "Status"),
             show="headings",
+            selectmode="extended",
         )
         for col in ("Title", "Subject", "Due", "Priority", "Status"):
             self.tree.heading(col, text=col)
             self.tree.column(col, width=160, anchor="center")
+        self.tree.tag_configure("done", background="#c8e6c9")
+        self.tree.tag_configure("overdue", background="#ffcdd2")
+        self.tree.tag_configure("today", background="#fff9c4")
         self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
         self.tree.bind("<Double-1>", self.show_task_details)
+        self.tree.bind("<Control-a>", lambda e: self.tree.select_all() or "break")
 
         btn_frame = tk.Frame(self.tab_tasks, bg="white")
         btn_frame.pack(fill="x", pady=10)
 
         done_btn = ttk.Button(btn_frame, text="Mark as Done", style="Big.TButton", command=self.mark_done)
         edit_btn = ttk.Button(btn_frame, text="Edit Task", style="Big.TButton", command=self.edit_task)
+        priority_btn = ttk.Button(btn_frame, text="Set Priority", style="Big.TButton", command=self.reprioritize_tasks)
         delete_btn = ttk.Button(btn_frame, text="Delete Task", style="Big.TButton", command=self.delete_task)
 
         btn_frame.columnconfigure(0, weight=1)
         btn_frame.columnconfigure(1, weight=1)
         btn_frame.columnconfigure(2, weight=1)
+        btn_frame.columnconfigure(3, weight=1)
 
         done_btn.grid(row=0, column=0, padx=20, pady=5)
         edit_btn.grid(row=0, column=1, padx=20, pady=5)
-        delete_btn.grid(row=0, column=2, padx=20, pady=5)
+        priority_btn.grid(row=0, column=2, padx=20, pady=5)
+        delete_btn.grid(row=0, column=3, padx=20, pady=5)
 
     def setup_add_tab(self):
         form = tk.Frame(self.tab_add, pady=15, bg="#ffffff")
@@ -265,15 +274,14 @@ class HomeworkPlanner:
             messagebox.showwarning("Missing", "Title is required")
             return
         subject = self.subject_entry.get().strip()
-        try:
-            due = f"{self.year_box.get()}-{self.month_box.get()}-{self.day_box.get()}"
-            due_date = datetime.strptime(due, "%Y-%m-%d")
-            if due_date.date() < datetime.today().date():
-                messagebox.showwarning("Invalid Date", "Due date cannot be in the past!")
-                return
-        except:
+        due = f"{self.year_box.get()}-{self.month_box.get()}-{self.day_box.get()}"
+        due_ord = due_ordinal(due)
+        if due_ord is None:
             messagebox.showwarning("Format Error", "Please select a valid due date.")
             return
+        if due_ord < today_ordinal():
+            messagebox.showwarning("Invalid Date", "Due date cannot be in the past!")
+            return
         try:
             priority = int(self.priority_box.get())
         except:
@@ -281,10 +289,9 @@ class HomeworkPlanner:
 
         details = self.details_entry.get("1.0", "end").strip()
 
-        tasks = load_tasks_from_json()
-        new_id = max([t["id"] for t in tasks], default=0) + 1
+        self.store.refresh()
         new_task = {
-            "id": new_id,
+            "id": self.store.allocate_id(),
             "title": title,
             "subject": subject,
             "due_at": due,
@@ -293,8 +300,7 @@ class HomeworkPlanner:
             "details": details,
             "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
-        tasks.append(new_task)
-        save_tasks_to_json(tasks)
+        self.store.put(new_task)
 
         self.clear_add_form()
         self.load_tasks()
@@ -342,9 +348,8 @@ class HomeworkPlanner:
                 messagebox.showwarning("Format", "Invalid date or time format.")
                 return
 
-            reminders = load_reminders_from_json()
-            reminders = [r for r in reminders if r.get("task_id") != task["id"]]
             reminder = {
+                "id": new_reminder_id(),
                 "task_id": task["id"],
                 "title": title,
                 "datetime": dt.strftime("%Y-%m-%d %H:%M"),
@@ -352,8 +357,9 @@ class HomeworkPlanner:
                 "note": note,
                 "status": "Pending"
             }
-            reminders.append(reminder)
-            save_reminders_to_json(reminders)
+            # Replaces the task's earlier reminders
+            self.store.write_batch(reminder_ops=[{"task_id": task["id"], "delete": True},
+                                                 {"task_id": task["id"], "add": reminder}])
             messagebox.showinfo("Success", "Reminder added and synced!")
             win.destroy()
 
@@ -366,62 +372,99 @@ class HomeworkPlanner:
         self.priority_box.set("3")
         self.details_entry.delete("1.0", tk.END)
 
-    def load_tasks(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        tasks = load_tasks_from_json()
-        tasks.sort(key=lambda x: x.get("due_at") or "")
+    def on_destroy(self, event):
+        if event.widget is self.root:
+            self.store.close()
+            # Closed now; a later planner window registers its own store
+            atexit.unregister(self.store.close)
 
-        subjects = {"All"}
-        for r in tasks:
-            if r.get("subject"):
-                subjects.add(r["subject"])
-        self.subject_filter["values"] = list(subjects)
+    def load_tasks(self):
+        """Reload after the tasks changed: re-read the store and re-filter, subject list included."""
+        self.store.refresh()
+        self.start_filter(with_subjects=True)
+
+    def on_tasks_changed(self, paths):
+        """Another process wrote the task files: apply its changes and re-filter."""
+        if self.store.refresh():
+            self.start_filter(with_subjects=True)
+
+    # ---------- Background filtering ----------
+    # Keystrokes only (re)start a short timer. When it fires, the query runs on
+    # a worker thread (the store hands back a consistent list of immutable
+    # records). Each run gets a generation number; a result that is not from
+    # the latest run is dropped, so only the newest filter reaches the tree.
+    def schedule_filter(self, event=None):
+        if self.filter_job is not None:
+            self.root.after_cancel(self.filter_job)
+        self.filter_job = self.root.after(FILTER_DELAY_MS, self.start_filter)
+
+    def start_filter(self, with_subjects=False):
+        if self.filter_job is not None:
+            self.root.after_cancel(self.filter_job)
+            self.filter_job = None
+        if self.filter_future is not None:
+            self.filter_future.cancel()  # only succeeds if it has not started yet
 
         status_f = self.status_filter.get()
         subject_f = self.subject_filter.get()
         search_q = self.search_entry.get().strip().lower()
-
-        for r in tasks:
-            if status_f != "All" and r["status"] != status_f:
-                continue
-            if subject_f != "All" and r["subject"] != subject_f:
-                continue
-            if search_q and search_q not in r["title"].lower():
-                continue
-
-            tags = ()
-            if r["status"] == "done":
-                tags = ("done",)
-            elif r["due_at"]:
-                try:
-                    due_date = datetime.strptime(r["due_at"], "%Y-%m-%d")
-                    if due_date < datetime.now():
-                        tags = ("overdue",)
-                    elif due_date.date() == datetime.today().date():
-                        tags = ("today",)
-                except:
-                    pass
-
-            self.tree.insert("", tk.END, iid=r["id"],
-                             values=(r["title"], r["subject"], r["due_at"] or "—", r["priority"], r["status"]),
-                             tags=tags)
-
-        self.tree.tag_configure("done", background="#c8e6c9")
-        self.tree.tag_configure("overdue", background="#ffcdd2")
-        self.tree.tag_configure("today", background="#fff9c4")
+        today = self.today
+
+        def run():
+            subjects = self.store.subjects() if with_subjects else None
+            # Ordered by due date, or by relevance when searching
+            tasks = self.store.query(status_f, subject_f, search_q)
+            # Row colours in one pass over the pre-parsed due dates
+            return subjects, list(zip(tasks, classify(tasks, today)))
+
+        self.filter_generation += 1
+        generation = self.filter_generation
+        self.filter_future = run_in_background(
+            self.root, run,
+            on_done=lambda result: self.show_tasks(generation, *result),
+            on_error=self.on_filter_error)
+
+    def show_tasks(self, generation, subjects, rows):
+        if generation != self.filter_generation or not self.root.winfo_exists():
+            return  # a newer filter is on its way
+        self.filter_future = None
+        if subjects is not None:
+            self.subject_filter["values"] = ["All"] + subjects
+        self.tree.set_rows(rows, key=lambda row: row[0]["id"], render=self.render_task_row)
+
+    def on_filter_error(self, exc):
+        messagebox.showerror("Error", f"Could not filter the tasks: {exc}", parent=self.root)
+
+    def render_task_row(self, row):
+        """Treeview values and colour tag for one (task, tag) row (called for visible rows only)."""
+        r, tag = row
+        return (r["title"], r["subject"], r["due_at"] or "—", r["priority"], r["status"]), (tag,) if tag else ()
+
+    # ---------- Batch actions ----------
+    # Each acts on every selected task with one store write and at most one
+    # reminders.json write, however many tasks are selected.
+    def selected_tasks(self):
+        self.store.refresh()
+        tasks = (self.store.get(int(iid)) for iid in self.tree.selection())
+        return [t for t in tasks if t is not None]
 
     def mark_done(self):
-        sel = self.tree.selection()
-        if not sel:
+        tasks = [t for t in self.selected_tasks() if t["status"] != "done"]
+        if not tasks:
             return
-        task_id = int(sel[0])
-        tasks = load_tasks_from_json()
-        for t in tasks:
-            if t["id"] == task_id:
-                t["status"] = "done"
-                break
-        save_tasks_to_json(tasks)
+        self.store.write_batch(puts=[dict(t, status="done") for t in tasks],
+                               reminder_ops=[{"task_id": t["id"], "set": {"status": "Done"}} for t in tasks])
+        self.load_tasks()
+
+    def reprioritize_tasks(self):
+        tasks = self.selected_tasks()
+        if not tasks:
+            return
+        priority = simpledialog.askinteger("Set Priority", f"New priority for {len(tasks)} task(s):",
+                                           minvalue=1, parent=self.root)
+        if priority is None:
+            return
+        self.store.write_batch(puts=[dict(t, priority=priority) for t in tasks if t["priority"] != priority])
         self.load_tasks()
 
     def edit_task(self):
@@ -429,8 +472,8 @@ class HomeworkPlanner:
         if not sel:
             return
         task_id = int(sel[0])
-        tasks = load_tasks_from_json()
-        row = next((t for t in tasks if t["id"] == task_id), None)
+        self.store.refresh()
+        row = self.store.get(task_id)
         if not row:
             return
 
@@ -467,16 +510,11 @@ class HomeworkPlanner:
         e_month = ttk.Combobox(date_frame, values=months, width=4, state="readonly", font=DEFAULT_FONT)
         e_day = ttk.Combobox(date_frame, values=days, width=4, state="readonly", font=DEFAULT_FONT)
 
-        if row["due_at"]:
-            try:
-                due_date = datetime.strptime(row["due_at"], "%Y-%m-%d")
-                e_year.set(str(due_date.year))
-                e_month.set(str(due_date.month).zfill(2))
-                e_day.set(str(due_date.day).zfill(2))
-            except:
-                e_year.set(str(datetime.now().year))
-                e_month.set(str(datetime.now().month).zfill(2))
-                e_day.set(str(datetime.now().day).zfill(2))
+        if row.get("due_ord"):
+            due_date = date.fromordinal(row["due_ord"])
+            e_year.set(str(due_date.year))
+            e_month.set(str(due_date.month).zfill(2))
+            e_day.set(str(due_date.day).zfill(2))
         else:
             e_year.set(str(datetime.now().year))
             e_month.set(str(datetime.now().month).zfill(2))
@@ -501,58 +539,54 @@ class HomeworkPlanner:
             if not e_title.get().strip():
                 messagebox.showwarning("Missing", "Title is required")
                 return
-            try:
-                due = f"{e_year.get()}-{e_month.get()}-{e_day.get()}"
-                due_date = datetime.strptime(due, "%Y-%m-%d")
-                if due_date.date() < datetime.today().date():
-                    messagebox.showwarning("Invalid Date", "Due date cannot be in the past!")
-                    return
-            except:
+            due = f"{e_year.get()}-{e_month.get()}-{e_day.get()}"
+            due_ord = due_ordinal(due)
+            if due_ord is None:
                 messagebox.showwarning("Format Error", "Please select a valid due date.")
                 return
+            if due_ord < today_ordinal():
+                messagebox.showwarning("Invalid Date", "Due date cannot be in the past!")
+                return
 
-            row["title"] = e_title.get()
-            row["subject"] = e_subject.get()
-            row["due_at"] = due
             try:
-                row["priority"] = int(e_priority.get())
+                priority = int(e_priority.get())
             except:
-                row["priority"] = 3
-            row["details"] = e_details.get("1.0", "end").strip()
-            save_tasks_to_json(tasks)
+                priority = 3
+            updated = dict(row,
+                           title=e_title.get(),
+                           subject=e_subject.get(),
+                           due_at=due,
+                           priority=priority,
+                           details=e_details.get("1.0", "end").strip())
+            # The task and its reminders change in one commit
+            self.store.write_batch(puts=[updated], reminder_ops=[{"task_id": updated["id"], "set": {
+                "title": updated["title"],
+                "note": updated["details"],
+                "datetime": due + " 09:00",
+                "status": "Pending",
+            }}])
             self.load_tasks()
 
-            reminders = load_reminders_from_json()
-            for rem in reminders:
-                if rem.get("task_id") == row["id"]:
-                    rem["title"] = row["title"]
-                    rem["note"] = row["details"]
-                    rem["datetime"] = (due + " 09:00") if due else rem["datetime"]
-                    rem["status"] = "Pending"
-            save_reminders_to_json(reminders)
-
             messagebox.showinfo("Success", "Task updated successfully!")
 
             if messagebox.askyesno("Update Reminder", "Do you want to update or add a reminder for this task?"):
-                self.add_reminder_from_task(row)
+                self.add_reminder_from_task(updated)
 
         tk.Button(form, text="Save", command=save, bg="#4caf50", fg="white", font=DEFAULT_FONT, width=20)\
             .grid(row=5, column=0, columnspan=2, pady=15)
 
     def delete_task(self):
-        sel = self.tree.selection()
-        if not sel:
+        tasks = self.selected_tasks()
+        if not tasks:
             return
-        task_id = int(sel[0])
-        if messagebox.askyesno("Delete", "Are you sure?"):
-            tasks = load_tasks_from_json()
-            tasks = [t for t in tasks if t["id"] != task_id]
-            save_tasks_to_json(tasks)
-            reminders = load_reminders_from_json()
-            reminders = [r for r in reminders if r.get("task_id") != task_id]
-            save_reminders_to_json(reminders)
+        question = "Are you sure?" if len(tasks) == 1 else f"Delete {len(tasks)} tasks?"
+        if messagebox.askyesno("Delete", question):
+            task_ids = [t["id"] for t in tasks]
+            self.store.write_batch(deletes=task_ids,
+                                   reminder_ops=[{"task_id": task_id, "delete": True} for task_id in task_ids])
             self.load_tasks()
-            messagebox.showinfo("Deleted", "Task deleted successfully!")
+            message = "Task deleted successfully!" if len(tasks) == 1 else f"{len(tasks)} tasks deleted."
+            messagebox.showinfo("Deleted", message)
 
 def main():
     root = tk.Tk()
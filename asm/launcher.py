@@ -0,0 +1,95 @@
+import importlib
+import os
+import subprocess
+import sys
+import time
+import tkinter as tk
+from tkinter import messagebox
+
+# "inprocess" opens each app as a Toplevel of the running home page,
+# "subprocess" starts a separate Python per app (the original behaviour).
+LAUNCH_MODE = os.environ.get("ASM_LAUNCH_MODE", "inprocess")
+
+# Card name -> (module, app class, script to run in subprocess mode)
+APPS = {
+    "CGPA & GPA Calculator": ("cgpa", "CalculatorApp", "cgpa.py"),
+    "Homework Planner": ("homeworkPlanner", "HomeworkPlanner", "homeworkPlanner.py"),
+    "Simple Reminder": ("reminders", "ReminderApp", "reminders.py"),
+}
+
+
+class AppLauncher:
+    """Open the sub-apps from the home page, one window per app.
+
+    Sub-app modules are imported lazily on the first click of their card, so
+    the home page does not pay for tkcalendar and friends at startup.
+    In-process mode reuses already imported modules and the home page's Tk
+    event loop; clicking a card whose window is still open brings it to the
+    front instead of opening a second copy. If an app fails to open in-process
+    it falls back to a subprocess.
+    `latencies` keeps the last time (ms) per app and kind of open:
+    "inprocess" is click to window shown, "raise" is click to an open window
+    brought to the front, and "subprocess-spawn" only covers starting the
+    process, not its window appearing. `python benchmarks.py launch`
+    compares click-to-window times for both modes.
+    """
+
+    def __init__(self, master, mode=None):
+        self.master = master
+        self.mode = mode or LAUNCH_MODE
+        self.windows = {}  # app name -> (Toplevel, app instance)
+        self.latencies = {}
+
+    def open(self, app_name):
+        if app_name not in APPS:
+            return False
+        if self.mode == "inprocess":
+            try:
+                self.open_inprocess(app_name)
+                return True
+            except Exception as exc:
+                messagebox.showwarning(
+                    "Opening in a new window",
+                    f"Could not open {app_name} here ({exc}). Starting it as a separate program instead.",
+                    parent=self.master)
+        self.open_subprocess(app_name)
+        return True
+
+    def open_inprocess(self, app_name):
+        start = time.perf_counter()
+        win, app = self.windows.get(app_name, (None, None))
+        if win is not None and win.winfo_exists():
+            if getattr(app, "running", True):
+                win.deiconify()
+                win.lift()
+                win.focus_force()
+                self.latencies[(app_name, "raise")] = (time.perf_counter() - start) * 1000
+                return win
+            # e.g. a closed ReminderApp whose scheduler has stopped
+            win.destroy()
+
+        module_name, class_name, _ = APPS[app_name]
+        module = importlib.import_module(module_name)  # no-op once imported
+        self.latencies.pop((app_name, "inprocess"), None)
+        win = tk.Toplevel(self.master)
+
+        def on_map(event):
+            if event.widget is win and (app_name, "inprocess") not in self.latencies:
+                self.latencies[(app_name, "inprocess")] = (time.perf_counter() - start) * 1000
+
+        win.bind("<Map>", on_map, add="+")
+        try:
+            app = getattr(module, class_name)(win)
+        except Exception:
+            win.destroy()
+            raise
+        self.windows[app_name] = (win, app)
+        return win
+
+    def open_subprocess(self, app_name):
+        start = time.perf_counter()
+        script = APPS[app_name][2]
+        proc = subprocess.Popen([sys.executable, script])
+        # the child's window shows up later, outside our reach
+        self.latencies[(app_name, "subprocess-spawn")] = (time.perf_counter() - start) * 1000
+        return proc
@@ -2,12 +2,79 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog, font
 import json
 import hashlib
+import hmac
 import os
+import sqlite3
+import sys
+import time
+from workers import run_in_background
 
-USER_FILE = "users.json"
+USER_FILE = "users.json"  # legacy list format, migrated into USER_DB once
+USER_DB = "users.db"
 
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+_user_db = None
+
+# PBKDF2 work factor. Stored in AUTH_CONFIG_FILE so it can be tuned per machine
+# with `python login.py --calibrate [target_ms]`.
+AUTH_CONFIG_FILE = "auth.json"
+DEFAULT_PBKDF2_ITERATIONS = 200_000
+
+def load_work_factor():
+    try:
+        with open(AUTH_CONFIG_FILE, "r") as f:
+            return int(json.load(f)["pbkdf2_iterations"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return DEFAULT_PBKDF2_ITERATIONS
+
+def hash_password(password, iterations=None):
+    """Salted PBKDF2-SHA256, stored as pbkdf2_sha256$<iterations>$<salt>$<hash>.
+
+    Slow on purpose; call it through run_in_background from Tk callbacks.
+    """
+    iterations = iterations or load_work_factor()
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"pbkdf2_sha256${iterations}${salt.hex()}${digest.hex()}"
+
+def verify_password(password, stored):
+    """Return (matches, needs_rehash) for a stored hash.
+
+    Unsalted SHA-256 hashes from older versions are still accepted, but
+    they, and PBKDF2 hashes with a different work factor, report
+    needs_rehash so they are upgraded on the next successful login.
+    """
+    if not stored.startswith("pbkdf2_sha256$"):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, stored), True
+    try:
+        _, iterations, salt, digest = stored.split("$")
+        iterations = int(iterations)
+        salt = bytes.fromhex(salt)
+    except ValueError:
+        return False, False
+    candidate = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations).hex()
+    return hmac.compare_digest(candidate, digest), iterations != load_work_factor()
+
+def calibrate_work_factor(target_ms=250, save=True):
+    """Pick the PBKDF2 iteration count that takes about target_ms here."""
+    probe = 20_000
+    start = time.perf_counter()
+    hashlib.pbkdf2_hmac("sha256", b"calibration", b"0" * 16, probe)
+    per_iteration_ms = (time.perf_counter() - start) * 1000 / probe
+    iterations = max(int(target_ms / per_iteration_ms) // 1000 * 1000, 10_000)
+    if save:
+        with open(AUTH_CONFIG_FILE, "w") as f:
+            json.dump({"pbkdf2_iterations": iterations}, f, indent=2)
+    return iterations
+
+# Verified when the user ID does not exist, so a miss costs the same as a hit.
+_DUMMY_HASH = None
+
+def dummy_hash():
+    global _DUMMY_HASH
+    if _DUMMY_HASH is None:
+        _DUMMY_HASH = hash_password("not a real password")
+    return _DUMMY_HASH
 
 def load_users():
     if not os.path.exists(USER_FILE):
@@ -25,10 +92,51 @@ def save_users(users):
     with open(USER_FILE, "w") as f:
         json.dump(users, f, indent=2)
 
+# ---------- Indexed user store ----------
+def user_db():
+    """Open (once) the SQLite user store, migrating users.json on first use."""
+    global _user_db
+    if _user_db is None:
+        conn = sqlite3.connect(USER_DB)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS users (id TEXT PRIMARY KEY, password TEXT NOT NULL)")
+        migrate_users_json(conn)
+        _user_db = conn
+    return _user_db
+
+def migrate_users_json(conn):
+    """Copy the old users.json list into the table, then rename the file."""
+    if not os.path.exists(USER_FILE):
+        return 0
+    users = load_users()
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO users (id, password) VALUES (?, ?)",
+                         ((u["id"], u["password"]) for u in users if "id" in u and "password" in u))
+    os.replace(USER_FILE, USER_FILE + ".migrated")
+    return len(users)
+
+def get_user(user_id):
+    row = user_db().execute("SELECT id, password FROM users WHERE id = ?", (user_id,)).fetchone()
+    return {"id": row[0], "password": row[1]} if row else None
+
+def add_user(user_id, password_hash):
+    """Insert one user. Returns False if the ID is already taken."""
+    try:
+        with user_db() as conn:
+            conn.execute("INSERT INTO users (id, password) VALUES (?, ?)", (user_id, password_hash))
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+def set_password(user_id, password_hash):
+    with user_db() as conn:
+        conn.execute("UPDATE users SET password = ? WHERE id = ?", (password_hash, user_id))
+
 class LoginWindow:
     def __init__(self, master, on_success):
         self.master = master
         self.on_success = on_success
+        self.busy = False
         master.title("Secure Login")
         master.configure(bg="#130513")
         master.geometry("400x400") # Set a fixed size
@@ -65,16 +173,42 @@ class LoginWindow:
         # Forgot Password button
         tk.Button(main_frame, text="Forgot Password", font=self.button_font, command=self.forgot_password, bg="#e74c3c", fg="white", activebackground="#c0392b", relief="flat", padx=20, pady=5).pack(fill="x")
 
+    def set_busy(self, busy):
+        """Ignore clicks and show a wait cursor while hashing runs in the background."""
+        self.busy = busy
+        self.master.config(cursor="watch" if busy else "")
+
+    def on_worker_error(self, exc):
+        self.set_busy(False)
+        messagebox.showerror("Error", f"Could not check the password: {exc}", parent=self.master)
+
     def login(self):
+        if self.busy:
+            return
         user_id = self.id_entry.get().strip()
         pw = self.pw_entry.get()
-        users = load_users()
-        for user in users:
-            if user["id"] == user_id and user["password"] == hash_password(pw):
-                messagebox.showinfo("Success", "Login successful!", parent=self.master)
-                self.on_success()  # <-- Add this line to trigger homepage
+        user = get_user(user_id)
+
+        def check():
+            matches, needs_rehash = verify_password(pw, user["password"] if user else dummy_hash())
+            # The upgraded hash (current scheme/work factor) is made in the same job,
+            # so it is saved before on_success() can tear down this window
+            new_hash = hash_password(pw) if user and matches and needs_rehash else None
+            return matches, new_hash
+
+        def done(result):
+            self.set_busy(False)
+            matches, new_hash = result
+            if not (user and matches):
+                messagebox.showerror("Error", "Invalid ID or password.", parent=self.master)
                 return
-        messagebox.showerror("Error", "Invalid ID or password.", parent=self.master)
+            if new_hash:
+                set_password(user_id, new_hash)
+            messagebox.showinfo("Success", "Login successful!", parent=self.master)
+            self.on_success()  # <-- Add this line to trigger homepage
+
+        self.set_busy(True)
+        run_in_background(self.master, check, on_done=done, on_error=self.on_worker_error)
 
     def register(self):
         user_id = self.id_entry.get().strip()
@@ -85,33 +219,49 @@ class LoginWindow:
         if len(pw) < 8:
             messagebox.showwarning("Input", "Password must be at least 8 characters.", parent=self.master)
             return
-        users = load_users()
-        if any(user["id"] == user_id for user in users):
+        if self.busy:
+            return
+        if get_user(user_id):
             messagebox.showerror("Error", "User ID already exists.", parent=self.master)
             return
-        users.append({"id": user_id, "password": hash_password(pw)})
-        save_users(users)
-        messagebox.showinfo("Success", "Registration successful!", parent=self.master)
+
+        def done(password_hash):
+            self.set_busy(False)
+            if not add_user(user_id, password_hash):
+                messagebox.showerror("Error", "User ID already exists.", parent=self.master)
+                return
+            messagebox.showinfo("Success", "Registration successful!", parent=self.master)
+
+        self.set_busy(True)
+        run_in_background(self.master, hash_password, pw, on_done=done, on_error=self.on_worker_error)
         
     def forgot_password(self):
         user_id = self.id_entry.get().strip()
+        if self.busy:
+            return
         if not user_id:
             messagebox.showwarning("Input", "Enter your User ID to reset password.", parent=self.master)
             return
-        users = load_users()
-        for user in users:
-            if user["id"] == user_id:
-                new_pw = simpledialog.askstring("Reset Password", "Enter new password (min 8 chars):", show="*", parent=self.master)
-                if new_pw and len(new_pw) >= 8:
-                    user["password"] = hash_password(new_pw)
-                    save_users(users)
+        if get_user(user_id):
+            new_pw = simpledialog.askstring("Reset Password", "Enter new password (min 8 chars):", show="*", parent=self.master)
+            if new_pw and len(new_pw) >= 8:
+                def done(password_hash):
+                    self.set_busy(False)
+                    set_password(user_id, password_hash)
                     messagebox.showinfo("Success", "Password reset successful!", parent=self.master)
-                else:
-                    messagebox.showwarning("Input", "Password too short or invalid.", parent=self.master)
-                return
+
+                self.set_busy(True)
+                run_in_background(self.master, hash_password, new_pw, on_done=done, on_error=self.on_worker_error)
+            else:
+                messagebox.showwarning("Input", "Password too short or invalid.", parent=self.master)
+            return
         messagebox.showerror("Error", "User ID not found.", parent=self.master)
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["--calibrate"]:
+        target = float(sys.argv[2]) if len(sys.argv) > 2 else 250
+        print(f"PBKDF2 iterations for ~{target:.0f} ms: {calibrate_work_factor(target)} (saved to {AUTH_CONFIG_FILE})")
+        sys.exit()
     root = tk.Tk()
     def on_login_success():
         # This function would be where you open the main application window
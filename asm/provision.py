@@ -0,0 +1,95 @@
+"""Create many user accounts at once from a CSV file.
+
+    python provision.py intake.csv [--workers N] [--dry-run]
+
+The CSV has one `id,password` pair per row (a header row with those names
+is optional). Passwords are hashed in a process pool across all cores, IDs
+that already exist (in the store or earlier in the file) are rejected, and
+all new users are committed in a single transaction.
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import login
+
+CHUNK_SIZE = 2000
+
+
+def read_rows(path):
+    """Yield (line_no, id, password) from the CSV without loading it all."""
+    with open(path, newline="") as f:
+        for line_no, row in enumerate(csv.reader(f), start=1):
+            if not row or not row[0].strip():
+                continue
+            if line_no == 1 and [c.strip().lower() for c in row[:2]] == ["id", "password"]:
+                continue
+            yield line_no, row[0].strip(), row[1] if len(row) > 1 else ""
+
+
+def existing_ids(conn, ids):
+    placeholders = ",".join("?" * len(ids))
+    return {r[0] for r in conn.execute(f"SELECT id FROM users WHERE id IN ({placeholders})", ids)}
+
+
+def provision(path, workers=None, dry_run=False):
+    """Returns (created, rejected, seconds); rejected is a list of (line, id, reason)."""
+    conn = login.user_db()
+    iterations = login.load_work_factor()
+    hasher = partial(login.hash_password, iterations=iterations)
+    seen, rejected, created = set(), [], 0
+    start = time.perf_counter()
+
+    rows = read_rows(path)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        conn.execute("BEGIN")
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, CHUNK_SIZE))
+                if not chunk:
+                    break
+                taken = existing_ids(conn, [user_id for _, user_id, _ in chunk])
+                accepted = []
+                for line_no, user_id, pw in chunk:
+                    if user_id in seen or user_id in taken:
+                        rejected.append((line_no, user_id, "duplicate ID"))
+                    elif len(pw) < 8:
+                        rejected.append((line_no, user_id, "password shorter than 8 characters"))
+                    else:
+                        seen.add(user_id)
+                        accepted.append((user_id, pw))
+                chunksize = max(len(accepted) // ((workers or os.cpu_count() or 1) * 4), 1)
+                hashes = pool.map(hasher, [pw for _, pw in accepted], chunksize=chunksize)
+                conn.executemany("INSERT INTO users (id, password) VALUES (?, ?)",
+                                 zip((user_id for user_id, _ in accepted), hashes))
+                created += len(accepted)
+            conn.execute("ROLLBACK" if dry_run else "COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    return created, rejected, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-create user accounts from a CSV of id,password.")
+    parser.add_argument("csv_file")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: all cores)")
+    parser.add_argument("--dry-run", action="store_true", help="validate and hash, but do not save")
+    args = parser.parse_args(argv)
+
+    created, rejected, seconds = provision(args.csv_file, args.workers, args.dry_run)
+    for line_no, user_id, reason in rejected:
+        print(f"line {line_no}: {user_id}: {reason}", file=sys.stderr)
+    verb = "Validated" if args.dry_run else "Created"
+    rate = created / seconds if seconds else 0.0
+    print(f"{verb} {created} users, rejected {len(rejected)}, in {seconds:.1f}s ({rate:.0f} users/s)")
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Repeat rules for reminders, with occurrences worked out in closed form.
+
+A Recurrence is anchored at its first occurrence `start` and saved with
+the reminder as:
+
+    {"start": "2025-09-01 09:00", "freq": "weekly", "interval": 2,
+     "weekdays": [0, 2], "until": "2026-06-30", "count": 20}
+
+freq        "daily", "weekly" or "monthly"
+interval    every N days / weeks / months (default 1)
+weekdays    weekly only: 0 = Monday ... 6 = Sunday (default: start's weekday)
+until       the last date an occurrence may fall on
+count       at most this many occurrences in all
+
+Monthly rules keep start's day of the month, moved back to the month's
+last day when it is shorter (31 Jan, 29 Feb, 31 Mar in a leap year).
+
+next_after(t) computes the first occurrence after t from the distance
+between start and t, instead of stepping one period at a time. A reminder
+the app did not show for months therefore gets its next real occurrence
+in one call. occurrences(begin, end) yields a range lazily for agenda
+views, one next_after() per occurrence.
+"""
+import bisect
+import calendar
+from datetime import date, datetime, timedelta
+
+FREQUENCIES = ("daily", "weekly", "monthly")
+REPEAT_FREQ = {"Daily": "daily", "Weekly": "weekly", "Monthly": "monthly"}  # the Repeat menu
+DT_FORMAT = "%Y-%m-%d %H:%M"
+DAY = timedelta(days=1)
+WEEK = timedelta(weeks=1)
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+class Recurrence:
+    def __init__(self, start, freq="daily", interval=1, weekdays=None, until=None, count=None):
+        if freq not in FREQUENCIES:
+            raise ValueError(f"unknown repeat frequency {freq!r}")
+        if interval < 1 or (count is not None and count < 1):
+            raise ValueError("interval and count must be at least 1")
+        self.start = start
+        self.freq = freq
+        self.interval = interval
+        self.weekdays = sorted(set(weekdays)) if weekdays else [start.weekday()]
+        self.until = until
+        self.count = count
+        # Weekly: week w starts at week0 + w weeks, and is in the rule when w % interval == 0.
+        # Occurrence n of the rule is weekday n % len(weekdays) of the rule's week n // len(weekdays),
+        # counting the weekdays of start's week that fall before start
+        self.week0 = start - start.weekday() * DAY
+        self.skipped = bisect.bisect_left(self.weekdays, start.weekday())
+
+    @classmethod
+    def from_repeat(cls, repeat, start):
+        """The rule for a Repeat menu choice ("Daily", "Weekly", "Monthly"), or None."""
+        return cls(start, REPEAT_FREQ[repeat]) if repeat in REPEAT_FREQ else None
+
+    @classmethod
+    def from_dict(cls, data):
+        until = data.get("until")
+        return cls(datetime.strptime(data["start"], DT_FORMAT), data.get("freq", "daily"),
+                   data.get("interval", 1), data.get("weekdays"),
+                   date.fromisoformat(until) if until else None, data.get("count"))
+
+    def to_dict(self):
+        data = {"start": self.start.strftime(DT_FORMAT), "freq": self.freq, "interval": self.interval}
+        if self.freq == "weekly":
+            data["weekdays"] = list(self.weekdays)
+        if self.until is not None:
+            data["until"] = self.until.isoformat()
+        if self.count is not None:
+            data["count"] = self.count
+        return data
+
+    def with_start(self, start):
+        """The same rule from a new first occurrence (weekdays follow it unless chosen explicitly)."""
+        weekdays = None if self.weekdays == [self.start.weekday()] else self.weekdays
+        return Recurrence(start, self.freq, self.interval, weekdays, self.until, self.count)
+
+    def describe(self):
+        """Short text for the reminder list, e.g. "Every 2 weeks on Mon, Wed"."""
+        unit = {"daily": "day", "weekly": "week", "monthly": "month"}[self.freq]
+        text = f"Every {unit}" if self.interval == 1 else f"Every {self.interval} {unit}s"
+        if self.freq == "weekly":
+            text += " on " + ", ".join(WEEKDAY_NAMES[d] for d in self.weekdays)
+        if self.until is not None:
+            text += f" until {self.until.isoformat()}"
+        if self.count is not None:
+            text += f", {self.count} times"
+        return text
+
+    # ---------- Occurrences ----------
+    def next_after(self, t):
+        """The first occurrence strictly after `t`, or None once the rule has ended."""
+        t = max(t, self.start - timedelta(microseconds=1))  # the first occurrence is start at the earliest
+        if self.freq == "daily":
+            n, occurrence = self.daily_after(t)
+        elif self.freq == "weekly":
+            n, occurrence = self.weekly_after(t)
+        else:
+            n, occurrence = self.monthly_after(t)
+        if self.count is not None and n >= self.count:
+            return None
+        if self.until is not None and occurrence.date() > self.until:
+            return None
+        return occurrence
+
+    def occurrences(self, begin, end):
+        """Occurrences with begin <= occurrence < end, in order, computed as they are consumed."""
+        occurrence = self.next_after(begin - timedelta(microseconds=1))
+        while occurrence is not None and occurrence < end:
+            yield occurrence
+            occurrence = self.next_after(occurrence)
+
+    # Each returns (n, occurrence): the first occurrence after t and its number, counting start as 0
+    def daily_after(self, t):
+        step = self.interval * DAY
+        n = (t - self.start) // step + 1
+        return n, self.start + n * step
+
+    def weekly_after(self, t):
+        days, per_week = self.weekdays, len(self.weekdays)
+        week = (t - self.week0) // WEEK
+        if week % self.interval == 0:
+            # a later weekday in t's own week
+            j = bisect.bisect_right(days, (t - self.week0 - week * WEEK) // DAY)
+            if j < per_week:
+                return (week // self.interval) * per_week + j - self.skipped, self.week0 + week * WEEK + days[j] * DAY
+        period = week // self.interval + 1
+        return period * per_week - self.skipped, self.week0 + period * self.interval * WEEK + days[0] * DAY
+
+    def monthly_after(self, t):
+        months = (t.year - self.start.year) * 12 + t.month - self.start.month
+        n = max(months // self.interval, 0)
+        occurrence = self.month_occurrence(n)
+        if occurrence <= t:
+            n += 1
+            occurrence = self.month_occurrence(n)
+        return n, occurrence
+
+    def month_occurrence(self, n):
+        month0 = self.start.month - 1 + n * self.interval
+        year, month = self.start.year + month0 // 12, month0 % 12 + 1
+        day = min(self.start.day, calendar.monthrange(year, month)[1])
+        return self.start.replace(year=year, month=month, day=day)
@@ -0,0 +1,108 @@
+"""Reminders that belong to homework tasks, found and changed by task ID.
+
+reminders.json is one JSON list shared with the Reminders app. Entries
+created for a task carry its "task_id". by_task() maps task IDs to
+positions in the (datastore-cached) list. It is built once per version of
+the file, so a task operation goes straight to its own reminders instead
+of scanning every entry.
+
+apply_ops() takes the reminder side of a task change as a list of ops:
+
+    {"task_id": 7, "delete": True}              remove the task's reminders
+    {"task_id": 7, "set": {"status": "Done"}}   update fields of each of them
+    {"task_id": 7, "add": {...}}                add one (replaced if its "id" exists)
+    {"add_from": "reminders.json.ab12.import"}  the ops on each line of that file (bulk imports)
+
+The task stores write these ops into the same commit as the task change
+and re-apply them after a crash (see write_batch in taskstore). Applying
+the same ops twice leaves the file as applying them once.
+"""
+import json
+import os
+import uuid
+
+import datastore
+
+REMINDER_FILE = "reminders.json"
+
+_indexes = {}  # path -> (document, {task_id: [positions]})
+
+
+def new_reminder_id():
+    return uuid.uuid4().hex[:12]
+
+
+def reminder_path(task_path):
+    """reminders.json in the same folder as the task file."""
+    return os.path.join(os.path.dirname(task_path), REMINDER_FILE)
+
+
+def by_task(path=REMINDER_FILE):
+    """(reminders, {task_id: [positions]}) for the current contents of `path`."""
+    reminders = datastore.load_json(path)
+    cached = _indexes.get(path)
+    if cached is not None and cached[0] is reminders:
+        return reminders, cached[1]
+    index = {}
+    for position, rem in enumerate(reminders):
+        task_id = rem.get("task_id") if isinstance(rem, dict) else None
+        if task_id is not None:
+            index.setdefault(task_id, []).append(position)
+    _indexes[path] = (reminders, index)
+    return reminders, index
+
+
+def reminders_for(task_id, path=REMINDER_FILE):
+    reminders, index = by_task(path)
+    return [reminders[p] for p in index.get(task_id, [])]
+
+
+def expand(ops):
+    """The ops with each "add_from" replaced by the ops in its file (one JSON op per line)."""
+    for op in ops:
+        if "add_from" not in op:
+            yield op
+        elif os.path.exists(op["add_from"]):  # gone: applied and cleaned up already
+            with open(op["add_from"], encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+
+
+def apply_ops(ops, path=REMINDER_FILE):
+    """Apply reminder ops for some tasks and save the file once. Untouched entries are left as they are."""
+    if not ops:
+        return
+    reminders, index = by_task(path)
+    groups = {}  # task_id -> its reminders after the ops
+    for op in expand(ops):
+        task_id = op["task_id"]
+        if task_id not in groups:
+            groups[task_id] = [reminders[p] for p in index.get(task_id, [])]
+        group = groups[task_id]
+        if op.get("delete"):
+            group.clear()
+        elif "set" in op:
+            group[:] = [dict(rem, **op["set"]) for rem in group]
+        elif "add" in op:
+            rem = dict(op["add"], task_id=task_id)
+            same = [i for i, r in enumerate(group) if rem.get("id") and r.get("id") == rem["id"]]
+            if same:
+                group[same[0]] = rem
+            else:
+                group.append(rem)
+
+    # Splice each group in where the task's first reminder was (new groups go last)
+    positions = sorted(p for task_id in groups for p in index.get(task_id, []))
+    first = {index[task_id][0]: task_id for task_id in groups if task_id in index}
+    updated, last = [], 0
+    for p in positions:
+        updated.extend(reminders[last:p])
+        if p in first:
+            updated.extend(groups[first[p]])
+        last = p + 1
+    updated.extend(reminders[last:])
+    for task_id, group in groups.items():
+        if task_id not in index:
+            updated.extend(group)
+    if updated != reminders:
+        datastore.save_json(path, updated, indent=4)
@@ -1,29 +1,40 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-import threading
-import time
-import json
-import os
-from datetime import datetime, timedelta
+import queue
+from datetime import datetime
 from tkcalendar import DateEntry
 import subprocess  # Add this import at the top if not present
+import hashlib
+import datastore
+from reminderlinks import new_reminder_id
+from widgets import TreeReconciler
+from watcher import FileWatcher
+from scheduler import ReminderScheduler
+from recurrence import REPEAT_FREQ, Recurrence
 
 DATA_FILE = "reminders.json"
 HOMEWORK_FILE = "homeworkPlanner.json"
+NOTIFY_POLL_MS = 250  # how often the Tk thread drains the scheduler's fire events
+MAX_LISTED = 10  # reminders spelled out in one combined notification
 
 REM_FONT = ('Arial', 11)
 
 class Reminder:
-    def __init__(self, title, dt, note="", repeat="None", status="Pending", category="Others"):
+    def __init__(self, title, dt, note="", repeat="None", status="Pending", category="Others", rid=None,
+                 task_id=None):
+        # Stable ID: used as the Treeview iid so refreshes can be diffed row by row
+        self.id = rid or new_reminder_id()
         self.title = title
         self.datetime = dt
         self.note = note
         self.repeat = repeat
         self.status = status
         self.category = category
+        self.task_id = task_id  # set for reminders of a Homework Planner task
 
     def to_dict(self):
-        return {
+        data = {
+            "id": self.id,
             "title": self.title,
             "datetime": self.datetime.strftime("%Y-%m-%d %H:%M"),
             "repeat": self.repeat,
@@ -31,6 +42,9 @@ class Reminder:
             "status": self.status,
             "category": self.category
         }
+        if self.task_id is not None:
+            data["task_id"] = self.task_id
+        return data
 
     @classmethod
     def from_dict(cls, data):
@@ -38,24 +52,35 @@ class Reminder:
         repeat = data.get("repeat", "None")
         status = data.get("status", "Pending")
         category = data.get("category", "Others")
-        if repeat in ("Daily", "Weekly"):
+        # Entries written before IDs existed get one derived from their content,
+        # so it stays the same every time the file is read until it is saved
+        rid = data.get("id") or hashlib.sha1(
+            f"{data['title']}|{data['datetime']}|{data.get('task_id')}".encode()).hexdigest()[:12]
+        if repeat in REPEAT_FREQ or data.get("rule"):
+            rule = Recurrence.from_dict(data["rule"]) if data.get("rule") else None
             return RecurringReminder(
-                data["title"], dt, data.get("note", ""), repeat, status, category
+                data["title"], dt, data.get("note", ""), repeat, status, category, rid, data.get("task_id"), rule
             )
         else:
             return Reminder(
-                data["title"], dt, data.get("note", ""), repeat, status, category
+                data["title"], dt, data.get("note", ""), repeat, status, category, rid, data.get("task_id")
             )
 
 class RecurringReminder(Reminder):
-    def __init__(self, title, dt, note="", repeat="None", status="Pending", category="Others"):
-        super().__init__(title, dt, note, repeat, status, category)
-    def next_occurrence(self):
-        if self.repeat == "Daily":
-            return self.datetime + timedelta(days=1)
-        elif self.repeat == "Weekly":
-            return self.datetime + timedelta(weeks=1)
-        return None
+    def __init__(self, title, dt, note="", repeat="None", status="Pending", category="Others", rid=None,
+                 task_id=None, rule=None):
+        super().__init__(title, dt, note, repeat, status, category, rid, task_id)
+        # The whole repeat rule (see recurrence), anchored at the first occurrence
+        self.rule = rule or Recurrence.from_repeat(repeat, dt) or Recurrence(dt)
+
+    def to_dict(self):
+        data = super().to_dict()
+        data["rule"] = self.rule.to_dict()
+        return data
+
+    def next_occurrence(self, after=None):
+        """The first occurrence after this one (and after `after`), or None when the rule has ended."""
+        return self.rule.next_after(max(self.datetime, after) if after else self.datetime)
 
 class ReminderApp:
     def __init__(self, master):
@@ -66,7 +91,7 @@ class ReminderApp:
 
         self.reminders = []
         self.load_reminders()
-        self.editing_index = None
+        self.editing_id = None
 
         input_frame = tk.LabelFrame(master, text="Set a Reminder", bg="#e0f7fa", font=('Arial', 12, 'bold'))
         input_frame.pack(padx=15, pady=15, fill="x")
@@ -105,7 +130,7 @@ class ReminderApp:
 
         tk.Label(input_frame, text="Repeat:", bg="#e0f7fa", font=REM_FONT).grid(row=3, column=0, sticky="w", padx=5, pady=5)
         self.repeat_var = tk.StringVar(value="None")
-        repeat_options = ["None", "Daily", "Weekly"]
+        repeat_options = ["None"] + list(REPEAT_FREQ)
         self.repeat_menu = ttk.Combobox(input_frame, textvariable=self.repeat_var, values=repeat_options, state="readonly", font=REM_FONT)
         self.repeat_menu.grid(row=3, column=1, padx=5, pady=5, sticky="ew", columnspan=3)
 
@@ -145,8 +170,6 @@ class ReminderApp:
         self.del_btn.pack(side="left", padx=10)
         self.edit_btn = tk.Button(btn_frame, text="Edit Selected", command=self.edit_reminder, bg="#ffa000", fg="white", font=REM_FONT)
         self.edit_btn.pack(side="left", padx=10)
-        self.refresh_btn = tk.Button(btn_frame, text="Refresh", command=self.refresh_list, bg="#1976d2", fg="white", font=REM_FONT)
-        self.refresh_btn.pack(side="left", padx=10)
 
         # --- Add Back Button ---
         back_btn = tk.Button(master, text="Back to Homepage", command=self.go_homepage, bg="#455a64", fg="white", font=REM_FONT)
@@ -159,11 +182,16 @@ class ReminderApp:
         self.footer.pack(side='bottom', fill="x")
 
         self.active_tree = self.tree_upcoming
+        self.tree_reconciler = TreeReconciler(self.tree_upcoming)
+        # Sleeps until the next pending reminder is due; refresh_list() keeps it in step
+        self.scheduler = ReminderScheduler(self.on_due)
+        self.notifications = queue.Queue()  # FireEvents from the scheduler thread
 
         self.refresh_list()
-        self.running = True
-        self.check_thread = threading.Thread(target=self.check_reminders, daemon=True)
-        self.check_thread.start()
+        # Reminders added elsewhere (e.g. from a planner task) appear without a Refresh button
+        self.watcher = FileWatcher(master, (DATA_FILE, HOMEWORK_FILE), self.on_files_changed)
+        self.scheduler.start()
+        self.master.after(NOTIFY_POLL_MS, self.drain_notifications)
 
         master.protocol("WM_DELETE_WINDOW", self.on_close)
         self.date_entry.set_date(datetime.now())
@@ -195,14 +223,22 @@ class ReminderApp:
             messagebox.showwarning("Input Error", "Invalid date or time format.")
             return
 
-        if repeat in ("Daily", "Weekly"):
-            reminder = RecurringReminder(title, dt, note, repeat, category=category)
+        idx = self.find_index(self.editing_id)
+        old = self.reminders[idx] if idx is not None else None
+        # Editing keeps the status and the planner task the reminder belongs to
+        status = old.status if old is not None else "Pending"
+        task_id = old.task_id if old is not None else None
+        if repeat in REPEAT_FREQ:
+            # and the rest of a custom rule (interval, weekdays, end)
+            rule = old.rule.with_start(dt) if isinstance(old, RecurringReminder) and old.repeat == repeat else None
+            reminder = RecurringReminder(title, dt, note, repeat, status, category, task_id=task_id, rule=rule)
         else:
-            reminder = Reminder(title, dt, note, repeat, category=category)
+            reminder = Reminder(title, dt, note, repeat, status, category, task_id=task_id)
 
-        if self.editing_index is not None:
-            self.reminders[self.editing_index] = reminder
-            self.editing_index = None
+        if idx is not None:
+            reminder.id = self.editing_id
+            self.reminders[idx] = reminder
+            self.editing_id = None
             self.add_btn.config(text="Add Reminder", bg="#00796b")
             messagebox.showinfo("Reminder Updated", "Your reminder has been updated.")
         else:
@@ -218,7 +254,9 @@ class ReminderApp:
         if not selected:
             messagebox.showwarning("No Selection", "Please select a reminder to edit.")
             return
-        idx = int(selected[0]) - 1
+        idx = self.find_index(selected[0])
+        if idx is None:
+            return
         rem = self.reminders[idx]
         self.title_entry.delete(0, tk.END)
         self.title_entry.insert(0, rem.title)
@@ -234,7 +272,7 @@ class ReminderApp:
         self.note_text.delete("1.0", tk.END)
         self.note_text.insert("1.0", rem.note)
         self.category_var.set(getattr(rem, "category", "Others"))
-        self.editing_index = idx
+        self.editing_id = rem.id
         self.add_btn.config(text="Update Reminder", bg="#388e3c")
 
     def clear_inputs(self):
@@ -246,104 +284,142 @@ class ReminderApp:
         self.repeat_var.set("None")
         self.note_text.delete("1.0", tk.END)
         self.category_var.set("Others")
-        self.editing_index = None
+        self.editing_id = None
         self.add_btn.config(text="Add Reminder", bg="#00796b")
 
+    def find_index(self, rid):
+        """Position of the reminder with this ID in self.reminders, or None."""
+        for idx, rem in enumerate(self.reminders):
+            if rem.id == rid:
+                return idx
+        return None
+
+    def on_files_changed(self, paths):
+        """Another window saved reminders: reload them; only the rows that differ are redrawn."""
+        self.refresh_list()
+
     def refresh_list(self):
         self.load_reminders()
-        for row in self.tree_upcoming.get_children():
-            self.tree_upcoming.delete(row)
-        now = datetime.now()
+        rows = []
         idx_upcoming = 1
         for rem in self.reminders:
             if not hasattr(rem, "title") or not hasattr(rem, "datetime") or not hasattr(rem, "repeat"):
                 continue
             dt_str = rem.datetime.strftime("%Y-%m-%d %I:%M %p")
-            repeat = rem.repeat
+            repeat = rem.rule.describe() if isinstance(rem, RecurringReminder) else rem.repeat
             note = rem.note
             category = getattr(rem, "category", "Others")
             display_note = (note[:40] + "...") if len(note) > 43 else note
-            self.tree_upcoming.insert(
-                "", "end", iid=idx_upcoming,
-                values=(idx_upcoming, rem.title, category, dt_str, repeat, display_note)
-            )
+            rows.append((rem.id, (idx_upcoming, rem.title, category, dt_str, repeat, display_note), ()))
             idx_upcoming += 1
+        # Only rows that changed are touched; see self.tree_reconciler.last_stats
+        self.tree_reconciler.apply(rows)
+        # Added, edited and deleted reminders reach the scheduler here
+        self.scheduler.sync({rem.id: rem.datetime for rem in self.reminders if rem.status == "Pending"})
 
     def delete_reminder(self):
         selected = self.active_tree.selection()
         if not selected:
             messagebox.showwarning("No Selection", "Please select a reminder to delete.")
             return
-        idx = int(selected[0]) - 1
-        del self.reminders[idx]
+        idx = self.find_index(selected[0])
+        if idx is not None:
+            del self.reminders[idx]
         self.save_reminders()
         self.refresh_list()
         messagebox.showinfo("Deleted", "Reminder deleted.")
 
     def load_reminders(self):
         reminders = []
-        # Load from reminders.json
-        if os.path.exists(DATA_FILE):
-            try:
-                with open(DATA_FILE, "r") as f:
-                    loaded = json.load(f)
-                    reminders.extend([
-                        Reminder.from_dict(rem)
-                        for rem in loaded
-                        if all(k in rem for k in ("title", "datetime", "repeat"))
-                    ])
-            except Exception:
-                pass
-        # Load from homeworkPlanner.json
-        if os.path.exists(HOMEWORK_FILE):
+        # Load from reminders.json, then homeworkPlanner.json (parsed copies are
+        # cached by datastore and only re-read when the file changes)
+        for path in (DATA_FILE, HOMEWORK_FILE):
             try:
-                with open(HOMEWORK_FILE, "r") as f:
-                    loaded = json.load(f)
-                    reminders.extend([
-                        Reminder.from_dict(rem)
-                        for rem in loaded
-                        if all(k in rem for k in ("title", "datetime", "repeat"))
-                    ])
+                reminders.extend([
+                    Reminder.from_dict(rem)
+                    for rem in datastore.load_json(path)
+                    if all(k in rem for k in ("title", "datetime", "repeat"))
+                ])
             except Exception:
                 pass
+        # The same entry may appear in both files; keep row IDs unique
+        seen = set()
+        for rem in reminders:
+            while rem.id in seen:
+                rem.id += "+"
+            seen.add(rem.id)
         self.reminders = reminders
 
     def save_reminders(self):
         try:
-            with open(DATA_FILE, "w") as f:
-                json.dump([rem.to_dict() for rem in self.reminders], f, indent=4)
+            datastore.save_json(DATA_FILE, [rem.to_dict() for rem in self.reminders], indent=4)
         except Exception:
             pass
 
-    def check_reminders(self):
-        while self.running:
-            now = datetime.now().replace(second=0, microsecond=0)
-            for idx, rem in list(enumerate(self.reminders)):
-                if rem.status == "Pending" and rem.datetime == now:
-                    self.show_notification(rem, idx)
-            time.sleep(30)
+    # ---------- Notifications ----------
+    # The scheduler thread only puts FireEvents on self.notifications; it never
+    # reads self.reminders or touches Tk. The Tk thread drains the queue and
+    # shows everything that came due together in one dialog, then updates
+    # those reminders by ID, so a list reloaded meanwhile cannot shift them.
+    def on_due(self, events):
+        """Called on the scheduler thread with the reminders that just came due (or were missed)."""
+        for event in events:
+            self.notifications.put(event)
+
+    def drain_notifications(self):
+        events = {}
+        while True:
+            try:
+                event = self.notifications.get_nowait()
+            except queue.Empty:
+                break
+            events[event.rid] = event
+        if events:
+            self.show_notifications(list(events.values()))
+        # Re-armed only after the dialog closes, so batches never overlap
+        self.master.after(NOTIFY_POLL_MS, self.drain_notifications)
+
+    def show_notifications(self, events):
+        by_id = {rem.id: rem for rem in self.reminders}
+        # An event for a reminder edited or deleted since it fired is stale
+        fired = [by_id[e.rid] for e in events
+                 if e.rid in by_id and by_id[e.rid].status == "Pending" and by_id[e.rid].datetime == e.due]
+        if not fired:
+            return
+        if len(fired) == 1:
+            rem = fired[0]
+            messagebox.showinfo("Reminder!", f"{rem.title}\n\n{rem.note}" if rem.note else rem.title)
+        else:
+            lines = [f"• {rem.title}" + (f" - {rem.note}" if rem.note else "") for rem in fired[:MAX_LISTED]]
+            if len(fired) > MAX_LISTED:
+                lines.append(f"...and {len(fired) - MAX_LISTED} more")
+            messagebox.showinfo(f"{len(fired)} Reminders!", "\n".join(lines))
 
-    def show_notification(self, rem, idx):
-        def popup_and_delete():
-            note = rem.note
-            msg = f"{rem.title}\n\n{note}" if note else rem.title
-            messagebox.showinfo("Reminder!", msg)
-            # Handle recurring reminders
-            if isinstance(rem, RecurringReminder):
-                next_dt = rem.next_occurrence()
-                if next_dt:
-                    rem.datetime = next_dt
-                    rem.status = "Pending"
-                else:
-                    del self.reminders[idx]
-            else:
-                del self.reminders[idx]
-            self.save_reminders()
-            self.refresh_list()
-        self.master.after(0, popup_and_delete)
+        fired_due = {rem.id: rem.datetime for rem in fired}
+        now = datetime.now()
+        kept = []
+        for rem in self.reminders:
+            if fired_due.get(rem.id) != rem.datetime:
+                kept.append(rem)
+                continue
+            # Recurring reminders move on (missed occurrences are shown once, not one by one);
+            # the rest are done
+            next_dt = rem.next_occurrence(now) if isinstance(rem, RecurringReminder) else None
+            if next_dt:
+                rem.datetime = next_dt
+                rem.status = "Pending"
+                kept.append(rem)
+        self.reminders = kept
+        self.save_reminders()
+        self.refresh_list()
+
+    @property
+    def running(self):
+        """False once the window was closed; the launcher then opens a fresh one (see launcher.py)."""
+        return self.scheduler.running
 
     def on_close(self):
-        self.running = False
+        self.scheduler.stop()
         self.save_reminders()
         self.master.withdraw()
 
@@ -0,0 +1,158 @@
+"""Fires reminders at their due time from a min-heap instead of polling.
+
+ReminderScheduler keeps the pending reminders in a heap of
+(due, seq, rid) entries. Its thread sleeps on a Condition until the
+earliest one is due, or until sync()/schedule() puts an earlier one in
+front (they notify it). A wakeup pops what is due: O(log n) per reminder,
+however many are pending.
+
+Changed and cancelled reminders are not searched for in the heap. Their
+old entries stay and are skipped when they reach the top, because
+`due_at` no longer matches. The heap is rebuilt once such stale entries
+outnumber the live ones.
+
+Anything due at or before "now" fires, so reminders that came due while
+the thread slept, the machine was suspended or the app was closed are
+caught up on the next wakeup. Condition.wait() times out on a clock that
+may stop during suspend, so the thread never sleeps longer than
+MAX_SLEEP_S before it re-reads the wall clock.
+
+A fired reminder is not fired again for the same due time. sync() with a
+new due time (e.g. the next occurrence of a recurring reminder) schedules
+it again.
+
+What fires is handed to on_due as FireEvents: immutable (rid, due)
+pairs. The callback runs on the scheduler thread, so it should only pass
+them on, e.g. put them on a queue.Queue that the Tk thread drains (see
+ReminderApp.drain_notifications). The due time tells the consumer which
+occurrence fired. If the reminder was edited in the meantime, the event
+is stale and can be dropped.
+"""
+import heapq
+import itertools
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+MAX_SLEEP_S = 60
+
+FireEvent = namedtuple("FireEvent", "rid due")
+
+
+class ReminderScheduler:
+    def __init__(self, on_due, clock=datetime.now):
+        self.on_due = on_due  # called with a list of FireEvents, on the scheduler thread
+        self.clock = clock
+        self.heap = []
+        self.due_at = {}  # rid -> due time, for every scheduled reminder
+        self.fired = set()  # rids already handed to on_due for their current due time
+        self.seq = itertools.count()  # keeps heap entries with the same due time in schedule order
+        self.cond = threading.Condition()
+        self.running = False
+        self.thread = None
+
+    # ---------- Changes ----------
+    def schedule(self, rid, due):
+        """Add a reminder, or move it to a new due time."""
+        with self.cond:
+            before = self.peek()
+            self.put(rid, due)
+            self.wake_if_sooner(before)
+
+    def cancel(self, rid):
+        with self.cond:
+            self.due_at.pop(rid, None)
+            self.fired.discard(rid)
+
+    def sync(self, dues):
+        """Make the schedule match {rid: due}. Only reminders whose due time changed touch the heap."""
+        with self.cond:
+            before = self.peek()
+            moved = [(due, next(self.seq), rid) for rid, due in dues.items() if self.due_at.get(rid) != due]
+            for due, _, rid in moved:
+                self.due_at[rid] = due
+                self.fired.discard(rid)
+            if len(moved) * 16 > len(self.heap):  # e.g. the first load: one heapify beats n pushes
+                self.heap.extend(moved)
+                heapq.heapify(self.heap)
+            else:
+                for entry in moved:
+                    heapq.heappush(self.heap, entry)
+            if len(self.due_at) > len(dues):
+                for rid in [rid for rid in self.due_at if rid not in dues]:
+                    del self.due_at[rid]
+                    self.fired.discard(rid)
+            if len(self.heap) > 2 * len(self.due_at) + 64:
+                self.rebuild()
+            self.wake_if_sooner(before)
+
+    def put(self, rid, due):
+        """(hold self.cond)"""
+        self.due_at[rid] = due
+        self.fired.discard(rid)
+        heapq.heappush(self.heap, (due, next(self.seq), rid))
+
+    def rebuild(self):
+        """Drop stale heap entries in one O(n) heapify (hold self.cond)."""
+        self.heap = [(due, next(self.seq), rid) for rid, due in self.due_at.items() if rid not in self.fired]
+        heapq.heapify(self.heap)
+
+    def wake_if_sooner(self, before):
+        if self.peek() != before:
+            self.cond.notify()
+
+    # ---------- Firing ----------
+    def peek(self):
+        """(due, rid) of the next reminder to fire, or None (hold self.cond)."""
+        heap = self.heap
+        while heap:
+            due, _, rid = heap[0]
+            if self.due_at.get(rid) == due and rid not in self.fired:
+                return due, rid
+            heapq.heappop(heap)  # changed, cancelled or already fired
+        return None
+
+    def pop_due(self, now):
+        """A FireEvent for every reminder due at or before `now`, earliest first (hold self.cond)."""
+        due_now = []
+        while True:
+            top = self.peek()
+            if top is None or top[0] > now:
+                return due_now
+            heapq.heappop(self.heap)
+            self.fired.add(top[1])
+            due_now.append(FireEvent(top[1], top[0]))
+
+    def wait_for_due(self):
+        """Sleep until something is due and return its FireEvents, or None once stopped (hold self.cond)."""
+        # A thread left over from before a stop()/start() bows out to the new one
+        while self.running and self.thread is threading.current_thread():
+            now = self.clock()
+            due_now = self.pop_due(now)
+            if due_now:
+                return due_now
+            top = self.peek()
+            timeout = MAX_SLEEP_S if top is None else (top[0] - now).total_seconds()
+            self.cond.wait(min(timeout, MAX_SLEEP_S))
+        return None
+
+    def run(self):
+        while True:
+            with self.cond:
+                due_now = self.wait_for_due()
+            if due_now is None:
+                return
+            self.on_due(due_now)
+
+    def start(self):
+        """Start (or, after stop(), restart) the scheduler thread."""
+        with self.cond:
+            self.running = True
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.cond.notify_all()
+        self.thread.start()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
@@ -0,0 +1,157 @@
+"""Inverted index for the Homework Planner search box.
+
+Tasks are tokenised over title, subject and details. Each token maps to
+{task_id: weight}, where a match in the title counts more than one in the
+subject, and the subject more than the details. Queries AND their terms.
+Every term also matches as a prefix ("ess" finds "essay"). Results are
+ranked by weight times IDF, so rare terms count more.
+
+The index is updated per task on add/edit/delete and saved next to the
+task store as JSON, so opening the planner does not re-tokenise every task.
+"""
+import bisect
+import json
+import math
+import os
+import re
+
+FIELD_WEIGHTS = {"title": 3, "subject": 2, "details": 1}
+INDEX_VERSION = 2
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN.findall((text or "").lower())
+
+
+def task_tokens(task):
+    """{token: weight} for one task."""
+    weights = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(task.get(field)):
+            weights[token] = weights.get(token, 0) + weight
+    return weights
+
+
+class SearchIndex:
+    def __init__(self):
+        self.postings = {}  # token -> {task_id: weight}
+        self.vocab = []     # sorted tokens, for prefix lookups
+        self.doc_count = 0
+
+    @classmethod
+    def build(cls, tasks):
+        index = cls()
+        for task in tasks:
+            for token, weight in task_tokens(task).items():
+                index.postings.setdefault(token, {})[task["id"]] = weight
+            index.doc_count += 1
+        index.vocab = sorted(index.postings)
+        return index
+
+    # ---------- Updates ----------
+    def add(self, task):
+        self.doc_count += 1
+        for token, weight in task_tokens(task).items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                bisect.insort(self.vocab, token)
+            posting[task["id"]] = weight
+
+    def remove(self, task):
+        """Remove a task, given the record as it was indexed."""
+        self.doc_count -= 1
+        for token in task_tokens(task):
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(task["id"], None)
+            if not posting:
+                del self.postings[token]
+                i = bisect.bisect_left(self.vocab, token)
+                if i < len(self.vocab) and self.vocab[i] == token:
+                    del self.vocab[i]
+
+    def update(self, old, new):
+        if old is not None:
+            self.remove(old)
+        if new is not None:
+            self.add(new)
+
+    # ---------- Queries ----------
+    def expand(self, term):
+        """Tokens starting with `term`."""
+        i = bisect.bisect_left(self.vocab, term)
+        tokens = []
+        while i < len(self.vocab) and self.vocab[i].startswith(term):
+            tokens.append(self.vocab[i])
+            i += 1
+        return tokens
+
+    def search(self, query):
+        """Task IDs matching every term of `query`, best match first."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        expansions = [[self.postings[t] for t in self.expand(term)] for term in terms]
+        # Start from the term with the fewest postings, then only probe its candidates
+        expansions.sort(key=lambda postings: sum(len(p) for p in postings))
+        total = max(self.doc_count, 1)
+        scores = None
+        for postings in expansions:
+            term_scores = {}
+            if scores is None:
+                for posting in postings:
+                    for tid, weight in posting.items():
+                        term_scores[tid] = term_scores.get(tid, 0) + weight
+            else:
+                for posting in postings:
+                    for tid in scores:
+                        weight = posting.get(tid)
+                        if weight:
+                            term_scores[tid] = term_scores.get(tid, 0) + weight
+            if not term_scores:
+                return []
+            idf = math.log(1 + total / len(term_scores))
+            if scores is None:
+                scores = {tid: w * idf for tid, w in term_scores.items()}
+            else:
+                scores = {tid: scores[tid] + w * idf for tid, w in term_scores.items()}
+        return sorted(scores, key=lambda tid: (-scores[tid], tid))
+
+    # ---------- Persistence ----------
+    def copy(self):
+        """An independent copy, e.g. to save on another thread while this one keeps changing."""
+        index = SearchIndex()
+        index.postings = {token: dict(posting) for token, posting in self.postings.items()}
+        index.vocab = list(self.vocab)
+        index.doc_count = self.doc_count
+        return index
+
+    def save(self, path, stamp):
+        """Save with `stamp`, the caller's note of what the index covers (any JSON value)."""
+        # each posting is flattened to [id, weight, id, weight, ...]
+        postings = {token: [x for item in posting.items() for x in item] for token, posting in self.postings.items()}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "stamp": stamp, "doc_count": self.doc_count,
+                       "postings": postings}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """(index, stamp) as saved, or None if there is no readable index of this version."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data["version"] != INDEX_VERSION:
+                return None
+            index = cls()
+            index.postings = {token: dict(zip(flat[::2], flat[1::2])) for token, flat in data["postings"].items()}
+            index.doc_count = data["doc_count"]
+            stamp = data["stamp"]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        index.vocab = sorted(index.postings)
+        return index, stamp
@@ -0,0 +1,224 @@
+"""Bulk import and export of homework tasks as CSV, newline-delimited JSON or JSON.
+
+    python taskio.py import schedule.csv [--reminders] [--dry-run]
+    python taskio.py export tasks.ndjson [--status done] [--subject BMCS2003]
+    python taskio.py export backup.json
+
+The format follows the file extension (.csv, .json, or .ndjson/.jsonl), or --format.
+CSV files need a header row. Import reads the columns title, subject,
+due_at, priority, status and details; other columns (such as the id of an
+export) are ignored and every imported task gets a new ID. Rows are
+streamed and validated in chunks with the same rules as the Add Task form:
+a title, and a YYYY-MM-DD due date that is not in the past. Everything that
+passes is saved in one commit (see import_tasks in taskstore), so a failed
+import leaves the tasks as they were. With --reminders each task also gets a
+09:00 reminder on its due date in the reminders.json next to the tasks,
+committed together with them.
+
+JSON files are whole-store backups in homework.json's format. They are
+exported and imported as they are, IDs and the ID counter included, so
+reminders stay linked to their tasks. Moving between the JSON and SQLite
+backends goes this way.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from duedates import due_ordinal, today_ordinal
+from reminderlinks import new_reminder_id
+from taskstore import open_task_store, read_snapshot
+
+CHUNK_SIZE = 5000
+TASK_FILE = "homework.json"
+IMPORT_FIELDS = ("title", "subject", "due_at", "priority", "status", "details")
+EXPORT_FIELDS = ("id",) + IMPORT_FIELDS + ("created_at",)
+
+
+def guess_format(path, fmt=None):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".json": "json"}.get(ext, "ndjson")
+
+
+def read_rows(path, fmt):
+    """Yield (line_no, row dict) without loading the whole file."""
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError:
+                    yield line_no, None
+
+
+def validate_chunk(chunk, today):
+    """Split a chunk into ([task fields], [(line_no, reason)]), using add_task's rules."""
+    accepted, rejected = [], []
+    for line_no, row in chunk:
+        if not isinstance(row, dict):
+            rejected.append((line_no, "not a JSON object"))
+            continue
+        title = str(row.get("title") or "").strip()
+        due = str(row.get("due_at") or "").strip()
+        due_ord = due_ordinal(due)
+        if not title:
+            rejected.append((line_no, "title is required"))
+        elif due_ord is None:
+            rejected.append((line_no, f"invalid due date {due!r}"))
+        elif due_ord < today:
+            rejected.append((line_no, f"due date {due} is in the past"))
+        else:
+            try:
+                priority = int(row.get("priority") or 3)
+            except (TypeError, ValueError):
+                priority = 3
+            accepted.append({
+                "title": title,
+                "subject": str(row.get("subject") or "").strip(),
+                "due_at": due,
+                "priority": priority,
+                "status": "done" if str(row.get("status") or "").lower() == "done" else "Todo",
+                "details": str(row.get("details") or "").strip(),
+                "due_ord": due_ord,
+            })
+    return accepted, rejected
+
+
+def import_file(path, fmt=None, store=None, reminders=False, dry_run=False):
+    """Returns (imported, rejected, seconds); rejected is a list of (line, reason)."""
+    fmt = guess_format(path, fmt)
+    store = store or open_task_store(TASK_FILE)
+    if fmt == "json":
+        start = time.perf_counter()
+        imported = len(read_snapshot(path)[0]) if dry_run else store.import_json(path)
+        return imported, [], time.perf_counter() - start
+    today = today_ordinal()
+    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rejected = []
+    counts = {"imported": 0}
+    start = time.perf_counter()
+    # IDs run on from here; import_tasks() moves the store's counter past the last one
+    first_id = 0 if dry_run else store.allocate_id()
+    # Reminder ops are written to a file next to the tasks as the rows stream by
+    # (not kept in memory); the commit refers to it (see reminderlinks.apply_ops)
+    spill = store.reminder_path + f".{new_reminder_id()}.import" if reminders and not dry_run else None
+
+    def tasks():
+        next_id = first_id
+        rows = read_rows(path, fmt)
+        out = open(spill, "w", encoding="utf-8") if spill else None
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, CHUNK_SIZE))
+                if not chunk:
+                    return
+                accepted, bad = validate_chunk(chunk, today)
+                rejected.extend(bad)
+                for fields in accepted:
+                    task = dict(fields, id=next_id, created_at=created_at)
+                    next_id += 1
+                    if out:
+                        out.write(json.dumps({"task_id": task["id"], "add": {
+                            "id": new_reminder_id(),
+                            "title": task["title"],
+                            "datetime": task["due_at"] + " 09:00",
+                            "repeat": "None",
+                            "note": task["details"],
+                            "status": "Pending",
+                        }}) + "\n")
+                    counts["imported"] += 1
+                    yield task
+        finally:
+            if out:
+                out.flush()
+                os.fsync(out.fileno())
+                out.close()
+
+    if dry_run:
+        for _ in tasks():
+            pass
+    else:
+        store.import_tasks(tasks(), reminder_ops=[{"add_from": spill}] if spill else ())
+        if spill:
+            os.remove(spill)  # applied; until then a crash recovery still needs it
+    return counts["imported"], rejected, time.perf_counter() - start
+
+
+def export_file(path, fmt=None, store=None, status="All", subject="All"):
+    """Stream the tasks (in due-date order) to `path`. Returns (exported, seconds)."""
+    fmt = guess_format(path, fmt)
+    store = store or open_task_store(TASK_FILE)
+    if fmt == "json":
+        start = time.perf_counter()
+        return store.export_json(path), time.perf_counter() - start
+    exported = 0
+    start = time.perf_counter()
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+        for task in store.iter_tasks():
+            if status != "All" and task["status"] != status:
+                continue
+            if subject != "All" and task["subject"] != subject:
+                continue
+            if fmt == "csv":
+                writer.writerow(task)
+            else:
+                f.write(json.dumps({k: task.get(k) for k in EXPORT_FIELDS}) + "\n")
+            exported += 1
+    os.replace(tmp, path)
+    return exported, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import or export homework tasks as CSV, NDJSON or JSON.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="add the tasks in a file")
+    imp.add_argument("file")
+    imp.add_argument("--format", choices=["csv", "ndjson", "json"])
+    imp.add_argument("--reminders", action="store_true", help="also add a 09:00 reminder on each due date")
+    imp.add_argument("--dry-run", action="store_true", help="validate only, do not save")
+    exp = sub.add_parser("export", help="write the tasks to a file")
+    exp.add_argument("file")
+    exp.add_argument("--format", choices=["csv", "ndjson", "json"])
+    exp.add_argument("--status", default="All")
+    exp.add_argument("--subject", default="All")
+    args = parser.parse_args(argv)
+    if guess_format(args.file, args.format) == "json":
+        if args.command == "import" and args.reminders:
+            parser.error("--reminders does not apply to JSON backups")
+        if args.command == "export" and (args.status, args.subject) != ("All", "All"):
+            parser.error("JSON backups hold every task; --status/--subject do not apply")
+
+    if args.command == "export":
+        exported, seconds = export_file(args.file, args.format, status=args.status, subject=args.subject)
+        rate = exported / seconds if seconds else 0.0
+        print(f"Exported {exported} tasks in {seconds:.1f}s ({rate:.0f} rows/s)")
+        return 0
+
+    imported, rejected, seconds = import_file(args.file, args.format, reminders=args.reminders,
+                                              dry_run=args.dry_run)
+    for line_no, reason in rejected:
+        print(f"line {line_no}: {reason}", file=sys.stderr)
+    verb = "Validated" if args.dry_run else "Imported"
+    rate = (imported + len(rejected)) / seconds if seconds else 0.0
+    print(f"{verb} {imported} tasks, rejected {len(rejected)}, in {seconds:.1f}s ({rate:.0f} rows/s)")
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
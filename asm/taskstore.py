@@ -0,0 +1,797 @@
+"""Journaled storage for homework tasks.
+
+TaskStore keeps the tasks in a snapshot file, {"next_id": n, "tasks": [...]}
+(a plain list, as homework.json held before, is still read), plus an
+append-only journal of changes. The journal is folded into a new snapshot
+in the background once it grows past `compact_bytes`. refresh() picks up
+what other processes appended without reloading everything.
+
+SqliteTaskStore is an optional backend with the same methods for very
+large task lists. Pick it with ASM_TASK_BACKEND=sqlite. Both export to and
+import from homework.json-style files, which keep task IDs (see taskio).
+"""
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import datastore
+import reminderlinks
+from duedates import today_ordinal, with_due_ord
+from searchindex import SearchIndex, tokenize
+
+COMPACT_BYTES = 256 * 1024
+TASK_BACKEND = os.environ.get("ASM_TASK_BACKEND", "journal")
+
+
+def open_task_store(path, backend=None):
+    """Open the configured task backend for the JSON file at `path`."""
+    if (backend or TASK_BACKEND) == "sqlite":
+        return SqliteTaskStore(os.path.splitext(path)[0] + ".db", json_path=path)
+    return TaskStore(path)
+
+
+def due_key(task):
+    """Position of a task in the due-date order: (due day, priority, id); undated tasks first."""
+    return (task.get("due_ord") or 0, task.get("priority") or 0, task["id"])
+
+
+def matches(task, status="All", subject="All"):
+    """The Tasks tab filters: exact status and subject."""
+    if status != "All" and task["status"] != status:
+        return False
+    return subject == "All" or task["subject"] == subject
+
+
+class TaskStore:
+    def __init__(self, path, compact_bytes=COMPACT_BYTES):
+        self.path = path
+        self.journal_path = path + ".log"
+        self.rotated_path = path + ".log.old"
+        self.index_path = path + ".idx"
+        self.reminder_path = reminderlinks.reminder_path(path)
+        self.compact_bytes = compact_bytes
+        self.lock = threading.Lock()  # taken by writes and by query()/subjects() on worker threads
+        self.compactor = None
+        self.tasks = {}
+        self.stamps = None
+        self.search_index = None
+        self.due_order = []  # sorted (due_ord, priority, id, task) entries, kept in order with bisect
+        self.next_id = 1
+        self.journal_offset = 0  # bytes of the live journal already applied to memory
+        self.pending = {}  # txn -> reminder ops committed but not yet applied
+        self.load()
+        self.recover()
+
+    # ---------- Reading ----------
+    def load(self):
+        tasks = {}
+        snapshot_tasks, next_id, pending = read_snapshot(self.path)
+        for task in snapshot_tasks:
+            tasks[task["id"]] = task
+        highest = max(tasks, default=0)
+        put_highest, _ = replay_journal(self.rotated_path, tasks, pending)
+        highest = max(highest, put_highest)
+        index, indexed_to = self.saved_index()
+        put_highest, self.journal_offset = replay_journal(self.journal_path, tasks, pending, index, indexed_to)
+        highest = max(highest, put_highest)
+        if self.journal_offset < indexed_to:  # the journal lost records the index has
+            index = None
+        self.pending = pending
+        self.next_id = max(next_id, highest + 1)
+        for task_id, task in tasks.items():
+            if "due_ord" not in task:  # written before due dates were pre-parsed
+                tasks[task_id] = with_due_ord(task)
+        self.tasks = tasks
+        self.due_order = sorted(due_key(t) + (t,) for t in tasks.values())
+        self.stamps = self.current_stamps()
+        self.search_index = index or SearchIndex.build(tasks.values())
+        self.search_index.doc_count = len(tasks)
+
+    def saved_index(self):
+        """(index, journal offset it covers) from the .idx file, or (None, 0) if it is not for these files.
+
+        The index is saved with the stamps of the snapshot and rotated journal
+        it was built on and how far into the live journal it goes. Records
+        appended after that are applied to it on load, so only a compaction
+        by another process forces a rebuild.
+        """
+        saved = SearchIndex.load(self.index_path)
+        if saved is None:
+            return None, 0
+        index, stamp = saved
+        current = self.current_stamps()
+        journal_size = current[2][1] if current[2] is not None else 0
+        try:
+            files, indexed_to = stamp
+        except (TypeError, ValueError):
+            return None, 0
+        if files != json.loads(json.dumps(current[:2])) or not 0 <= indexed_to <= journal_size:
+            return None, 0
+        return index, indexed_to
+
+    def index_stamp(self):
+        """What the in-memory search index covers, as saved_index() expects it (hold self.lock)."""
+        return [self.stamps[:2], self.journal_offset]
+
+    def current_stamps(self):
+        return tuple(datastore.file_stamp(p) for p in (self.path, self.rotated_path, self.journal_path))
+
+    def watch_paths(self):
+        """Files whose changes refresh() picks up (see watcher.FileWatcher)."""
+        return (self.path, self.rotated_path, self.journal_path)
+
+    def refresh(self):
+        """Catch up with changes other processes made on disk. True if any task changed."""
+        with self.lock:
+            if self.current_stamps() == self.stamps:
+                datastore.count(self.path, "hits")
+                return False
+            datastore.count(self.path, "misses")
+            changed = self.catch_up()
+            if changed is not None:
+                return changed
+            self.load()
+        self.recover()
+        return True
+
+    def catch_up(self):
+        """Apply the records other processes appended to the journal (hold self.lock).
+
+        Returns whether any task changed, or None when the files changed in
+        another way (a compaction, a cut torn tail) and need a full load().
+        """
+        stamps = self.current_stamps()
+        journal_size = stamps[2][1] if stamps[2] is not None else 0
+        if stamps[:2] != self.stamps[:2] or journal_size < self.journal_offset:
+            return None
+        ops, self.journal_offset = read_journal(self.journal_path, self.journal_offset, self.pending)
+        for op in ops:
+            if op["op"] == "put":
+                self.remember(with_due_ord(op["task"]))
+            else:
+                self.forget(op["id"])
+        self.stamps = stamps
+        return bool(ops)
+
+    def all(self):
+        return list(self.tasks.values())
+
+    def get(self, task_id):
+        return self.tasks.get(task_id)
+
+    def allocate_id(self):
+        """A fresh task ID, never used before (the counter is saved with the tasks that use it)."""
+        with self.lock:
+            self.sync()  # IDs other processes used
+            task_id = self.next_id
+            self.next_id += 1
+            return task_id
+
+    def query(self, status="All", subject="All", search=""):
+        """Tasks passing the filters, ordered by due date (by relevance when searching)."""
+        with self.lock:
+            if search:
+                found = (self.tasks.get(tid) for tid in self.search_index.search(search))
+                return [t for t in found if t is not None and matches(t, status, subject)]
+            if status == "All" and subject == "All":
+                return [entry[3] for entry in self.due_order]
+            tasks = [t for t in self.tasks.values() if matches(t, status, subject)]
+        tasks.sort(key=due_key)
+        return tasks
+
+    def upcoming(self, n, today=None):
+        """The next `n` open tasks due on or after `today` (a day ordinal), soonest first."""
+        today = today_ordinal() if today is None else today
+        tasks = []
+        with self.lock:
+            i = bisect.bisect_left(self.due_order, (today,))
+            while i < len(self.due_order) and len(tasks) < n:
+                task = self.due_order[i][3]
+                if task["status"] != "done":
+                    tasks.append(task)
+                i += 1
+        return tasks
+
+    def due_before(self, day, open_only=False):
+        """Dated tasks due before the day ordinal `day`, in due-date order."""
+        with self.lock:
+            end = bisect.bisect_left(self.due_order, (day,))
+            start = bisect.bisect_left(self.due_order, (1,))  # skip undated tasks
+            tasks = [entry[3] for entry in self.due_order[start:end]]
+        if open_only:
+            tasks = [t for t in tasks if t["status"] != "done"]
+        return tasks
+
+    def subjects(self):
+        with self.lock:
+            return sorted({t["subject"] for t in self.tasks.values() if t.get("subject")})
+
+    # ---------- Writing ----------
+    # Memory is updated before the journal write so a compaction triggered by
+    # that write snapshots the new state. Records are treated as immutable:
+    # replace a task with a new dict instead of editing the one returned by get().
+    def put(self, task):
+        """Add or replace one task."""
+        self.write_batch(puts=[task])
+
+    def delete(self, task_id):
+        self.write_batch(deletes=[task_id])
+
+    def write_batch(self, puts=(), deletes=(), reminder_ops=()):
+        """Add/replace and delete several tasks with one journal record, so one write, all or nothing.
+
+        `reminder_ops` (see reminderlinks.apply_ops) are committed in the same
+        record and then applied to reminders.json.
+        """
+        records = []
+        with self.lock:
+            for task in puts:
+                task = with_due_ord(task)
+                self.remember(task)
+                records.append({"op": "put", "task": task})
+            for task_id in deletes:
+                if self.forget(task_id):
+                    records.append({"op": "del", "id": task_id})
+        if reminder_ops:
+            txn = reminderlinks.new_reminder_id()
+            with self.lock:
+                self.pending[txn] = list(reminder_ops)  # kept by any snapshot taken before it is applied
+            self.append({"op": "batch", "records": records, "txn": txn, "reminders": list(reminder_ops)},
+                        compact=False)
+            self.apply_reminders(txn, reminder_ops)
+        elif len(records) == 1:
+            self.append(records[0])
+        elif records:
+            self.append({"op": "batch", "records": records})
+
+    def apply_reminders(self, txn, ops):
+        reminderlinks.apply_ops(ops, self.reminder_path)
+        self.append({"op": "applied", "txn": txn})
+
+    def recover(self):
+        """Finish reminder changes whose task commit made it to disk but whose "applied" record did not."""
+        for txn, ops in list(self.pending.items()):
+            self.apply_reminders(txn, ops)
+
+    def remember(self, task):
+        """Put a task in memory and the indexes (hold self.lock)."""
+        old = self.tasks.get(task["id"])
+        self.tasks[task["id"]] = task
+        self.next_id = max(self.next_id, task["id"] + 1)
+        self.search_index.update(old, task)
+        if old is not None:
+            self.unorder(old)
+        bisect.insort(self.due_order, due_key(task) + (task,))
+
+    def forget(self, task_id):
+        """Drop a task from memory and the indexes (hold self.lock). False if there was none."""
+        old = self.tasks.pop(task_id, None)
+        if old is None:
+            return False
+        self.search_index.remove(old)
+        self.unorder(old)
+        return True
+
+    def import_tasks(self, tasks, next_id=0, reminder_ops=()):
+        """Add many tasks as one commit: a single new snapshot instead of a journal line each.
+
+        `tasks` may be a generator; it is consumed once. `reminder_ops` is
+        read after that (so the generator may fill it as it goes), saved in
+        the same snapshot and then applied, like write_batch() does. The
+        search index and due_order are rebuilt afterwards rather than
+        updated per task.
+        """
+        if self.compactor is not None:
+            self.compactor.join()
+        with self.lock:
+            self.sync()
+            for task in tasks:
+                task = with_due_ord(task)
+                self.tasks[task["id"]] = task
+            self.next_id = max(self.next_id, next_id, max(self.tasks, default=0) + 1)
+            self.due_order = sorted(due_key(t) + (t,) for t in self.tasks.values())
+            self.search_index = SearchIndex.build(self.tasks.values())
+            ops = list(reminder_ops)
+            txn = reminderlinks.new_reminder_id() if ops else None
+            if txn:
+                self.pending[txn] = ops
+            snapshot = self.start_snapshot()
+        self.finish_snapshot(*snapshot)
+        if txn:
+            self.apply_reminders(txn, ops)
+
+    def iter_tasks(self):
+        """Every task in due-date order."""
+        with self.lock:
+            order = list(self.due_order)
+        return (entry[3] for entry in order)
+
+    def import_json(self, path):
+        """Add the tasks of a homework.json-style file, keeping their IDs and next_id. Returns how many."""
+        tasks, next_id, _ = read_snapshot(path)
+        self.import_tasks(tasks, next_id)
+        return len(tasks)
+
+    def export_json(self, path):
+        """Write every task to a homework.json-style file, IDs and next_id included. Returns how many."""
+        with self.lock:
+            self.sync()
+            tasks, next_id = self.all(), self.next_id
+        datastore.save_json(path, {"next_id": next_id, "tasks": tasks})
+        return len(tasks)
+
+    def unorder(self, task):
+        """Drop a task's entry from due_order (hold self.lock)."""
+        key = due_key(task)
+        i = bisect.bisect_left(self.due_order, key)
+        if i < len(self.due_order) and self.due_order[i][:3] == key:
+            del self.due_order[i]
+
+    def close(self):
+        """Save the search index for the files as they are now, so the next open can skip rebuilding it."""
+        if self.compactor is not None:
+            self.compactor.join()
+        with self.lock:
+            # stamped with the files as last read, so unread changes make the next load rebuild it
+            self.search_index.save(self.index_path, self.index_stamp())
+
+    def append(self, record, compact=True):
+        """Write one journal record:
+
+            {"op": "put", "task": {...}}        add or replace a task (whole record)
+            {"op": "del", "id": 7}              delete a task
+            {"op": "batch", "records": [...]}   several of the above, all or nothing
+            {"op": "batch", ..., "txn": "ab12", "reminders": [...]}
+                                                ... plus the linked reminder changes
+            {"op": "applied", "txn": "ab12"}    those reminder changes are in reminders.json
+
+        Every record holds whole tasks, so replaying one twice is harmless.
+        """
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self.lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                start = f.tell()
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+            if start == self.journal_offset:  # otherwise leave the records in between to refresh()
+                self.journal_offset = size
+                self.stamps = self.current_stamps()
+            if record["op"] == "applied":
+                self.pending.pop(record["txn"], None)  # before a compaction can copy it into the snapshot
+        if compact and size >= self.compact_bytes:
+            self.compact_in_background()
+
+    # ---------- Compaction ----------
+    def compact_in_background(self):
+        if self.compactor is not None and self.compactor.is_alive():
+            return
+        with self.lock:
+            self.sync()
+            snapshot = self.start_snapshot()
+            self.stamps = self.current_stamps()
+        self.compactor = threading.Thread(target=self.finish_snapshot, args=snapshot, daemon=True)
+        self.compactor.start()
+
+    def compact(self):
+        """Fold the journal into the snapshot now (blocking)."""
+        if self.compactor is not None:
+            self.compactor.join()
+        with self.lock:
+            self.sync()
+            snapshot = self.start_snapshot()
+        self.finish_snapshot(*snapshot)
+
+    def start_snapshot(self):
+        """Rotate the journal and copy what the new snapshot must hold, and its search index (hold self.lock)."""
+        self.rotate_journal()
+        return self.all(), self.next_id, dict(self.pending), self.search_index.copy()
+
+    def finish_snapshot(self, tasks, next_id, pending, index):
+        """Write the snapshot start_snapshot() copied, then save its search index.
+
+        Saved for the new snapshot and the start of the journal, so after a
+        crash the next load only applies what was written since.
+        """
+        self.write_snapshot(tasks, next_id, pending)
+        with self.lock:
+            files = self.stamps[:2]
+        index.save(self.index_path, [files, 0])
+
+    def sync(self):
+        """Bring memory up to date with the files other processes wrote (hold self.lock)."""
+        if self.current_stamps() != self.stamps and self.catch_up() is None:
+            self.load()
+
+    def rotate_journal(self):
+        """Move the live journal aside so new writes start a fresh one (hold self.lock)."""
+        if not os.path.exists(self.journal_path):
+            return
+        if os.path.exists(self.rotated_path):
+            # left over from an interrupted compaction: keep both, in order
+            with open(self.rotated_path, "ab") as old, open(self.journal_path, "rb") as new:
+                old.write(new.read())
+            os.remove(self.journal_path)
+        else:
+            os.replace(self.journal_path, self.rotated_path)
+        self.journal_offset = 0
+
+    def write_snapshot(self, tasks, next_id=None, pending=None):
+        if next_id is None:
+            next_id = max((t["id"] for t in tasks), default=0) + 1
+        snapshot = {"next_id": next_id, "tasks": tasks}
+        if pending:
+            snapshot["pending"] = pending  # reminder changes not applied yet
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        with self.lock:
+            os.replace(tmp, self.path)
+            try:
+                os.remove(self.rotated_path)
+            except FileNotFoundError:
+                pass
+            self.stamps = self.current_stamps()
+
+
+def read_snapshot(path):
+    """(tasks, next_id, pending reminder ops by txn) from a snapshot file; next_id is 0 for the legacy list format."""
+    if not os.path.exists(path):
+        return [], 0, {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = f.read().strip()
+        data = json.loads(data) if data else []
+    except (OSError, ValueError):
+        return [], 0, {}
+    if isinstance(data, list):
+        return data, 0, {}
+    return data.get("tasks", []), data.get("next_id", 0), data.get("pending", {})
+
+
+def read_journal(path, start=0, pending=None, stop=None):
+    """(ops, end): the put/del ops of the whole records from byte `start` on (up to byte `stop`),
+    in order, and the offset just past the last of them. Stops at a torn or unreadable record.
+
+    Reminder transactions without an "applied" record are left in `pending`.
+    """
+    pending = {} if pending is None else pending
+    ops = []
+    end = start
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return ops, end
+    with f:
+        f.seek(start)
+        for raw in f:
+            if stop is not None and end >= stop:
+                break
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(raw)
+                records = record["records"] if record["op"] == "batch" else [record]
+                for op in records:
+                    if op["op"] == "put":
+                        int(op["task"]["id"])
+                    elif op["op"] == "del":
+                        int(op["id"])
+                if record["op"] == "applied":
+                    pending.pop(record["txn"], None)
+                elif "txn" in record:
+                    pending[record["txn"]] = record["reminders"]
+            except (ValueError, KeyError, TypeError):
+                break
+            ops.extend(op for op in records if op["op"] in ("put", "del"))
+            end += len(raw)
+    return ops, end
+
+
+def replay_journal(path, tasks, pending=None, index=None, indexed_to=0):
+    """Apply journal records to `tasks` in place, stopping at a torn record.
+
+    `index`, a SearchIndex that already holds the records before byte
+    `indexed_to`, is updated with the ones after it.
+
+    Returns (the highest task ID put by any record, deleted since or not;
+    the size of the journal's good part).
+    """
+    head, good_bytes = read_journal(path, 0, pending, indexed_to) if index is not None else ([], 0)
+    tail, good_bytes = read_journal(path, good_bytes, pending)
+    highest = 0
+    for ops, indexed in ((head, True), (tail, False)):
+        for op in ops:
+            if op["op"] == "put":
+                task = op["task"]
+                old = tasks.get(task["id"])
+                tasks[task["id"]] = task
+                highest = max(highest, task["id"])
+            else:
+                task = None
+                old = tasks.pop(op["id"], None)
+            if index is not None and not indexed:
+                index.update(old, task)
+    if os.path.exists(path) and good_bytes < os.path.getsize(path):
+        # cut the damaged tail so new records are not appended after it
+        with open(path, "r+b") as f:
+            f.truncate(good_bytes)
+    return highest, good_bytes
+
+
+class SqliteTaskStore:
+    """Tasks in one SQLite table, indexed on due_at, subject and status.
+
+    Each task field is a column; any other keys a task may carry are kept
+    as JSON in `extra`.
+    """
+
+    COLUMNS = ("id", "title", "subject", "due_at", "priority", "status", "details", "created_at", "due_ord")
+    SELECT = "SELECT " + ", ".join(COLUMNS) + ", extra FROM tasks"
+    INSERT = ("INSERT OR REPLACE INTO tasks (" + ", ".join(COLUMNS) + ", extra) VALUES ("
+              + ", ".join("?" * (len(COLUMNS) + 1)) + ")")
+
+    def __init__(self, path, json_path=None):
+        self.path = path
+        self.owner = threading.get_ident()
+        self.local = threading.local()  # read connections for worker threads
+        self.readers = []  # all of them, to close with the store
+        self.readers_lock = threading.Lock()
+        new = not os.path.exists(path)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # INSERT OR REPLACE must fire the delete trigger that keeps tasks_fts in step
+        self.conn.execute("PRAGMA recursive_triggers=ON")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL DEFAULT '',
+                subject TEXT NOT NULL DEFAULT '',
+                due_at TEXT,
+                priority INTEGER,
+                status TEXT NOT NULL DEFAULT 'Todo',
+                details TEXT NOT NULL DEFAULT '',
+                created_at TEXT,
+                extra TEXT,
+                due_ord INTEGER
+            );
+            -- (due_at, title) also covers the title search, so it never reads whole rows
+            CREATE INDEX IF NOT EXISTS tasks_due_at ON tasks (due_at, title);
+            CREATE INDEX IF NOT EXISTS tasks_subject ON tasks (subject, status, due_at);
+            CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, due_at);
+            -- next_id: the ID allocator's high water mark, so deleted IDs are not reused
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+            -- reminder ops committed with a task change, until reminders.json has them
+            CREATE TABLE IF NOT EXISTS reminder_txns (txn TEXT PRIMARY KEY, ops TEXT NOT NULL);
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+        if "due_ord" not in columns:  # database from before due dates were pre-parsed
+            with self.conn:
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN due_ord INTEGER")
+                # julianday('0001-01-01') is 1721425.5, and date(1, 1, 1).toordinal() is 1
+                self.conn.execute("UPDATE tasks SET due_ord = CAST(julianday(due_at) - 1721424.5 AS INTEGER)"
+                                  " WHERE due_at IS NOT NULL AND date(due_at) = due_at")
+        # serves upcoming() and due_before()
+        self.conn.execute("CREATE INDEX IF NOT EXISTS tasks_due_ord ON tasks (due_ord, priority)")
+        self.fts = self.create_fts()
+        if new and json_path:
+            store = TaskStore(json_path)
+            self.import_tasks(store.all(), store.next_id)
+        self.reminder_path = reminderlinks.reminder_path(path)
+        self.data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        self.recover()
+
+    def create_fts(self):
+        """Full-text index over title/subject/details, kept in step by triggers. False if FTS5 is unavailable."""
+        exists = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'").fetchone()
+        if exists:
+            return True
+        try:
+            with self.conn:
+                self.conn.executescript("""
+                    CREATE VIRTUAL TABLE tasks_fts USING fts5(
+                        title, subject, details, content='tasks', content_rowid='id');
+                    CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+                        INSERT INTO tasks_fts (rowid, title, subject, details)
+                        VALUES (new.id, new.title, new.subject, new.details);
+                    END;
+                    CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+                        INSERT INTO tasks_fts (tasks_fts, rowid, title, subject, details)
+                        VALUES ('delete', old.id, old.title, old.subject, old.details);
+                    END;
+                    CREATE TRIGGER tasks_fts_update AFTER UPDATE ON tasks BEGIN
+                        INSERT INTO tasks_fts (tasks_fts, rowid, title, subject, details)
+                        VALUES ('delete', old.id, old.title, old.subject, old.details);
+                        INSERT INTO tasks_fts (rowid, title, subject, details)
+                        VALUES (new.id, new.title, new.subject, new.details);
+                    END;
+                    INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild');
+                """)
+        except sqlite3.OperationalError:
+            return False
+        return True
+
+    @classmethod
+    def row_values(cls, task):
+        task = with_due_ord(task)
+        extra = {k: v for k, v in task.items() if k not in cls.COLUMNS}
+        return (task["id"], task.get("title", ""), task.get("subject", ""), task.get("due_at") or None,
+                task.get("priority"), task.get("status", "Todo"), task.get("details", ""),
+                task.get("created_at"), task["due_ord"], json.dumps(extra) if extra else None)
+
+    @classmethod
+    def rows_to_tasks(cls, rows):
+        tasks = []
+        for row in rows:
+            task = dict(zip(cls.COLUMNS, row))
+            if row[-1]:
+                task.update(json.loads(row[-1]))
+            tasks.append(task)
+        return tasks
+
+    # ---------- Reading ----------
+    def reader(self):
+        """A connection usable on the calling thread; WAL lets workers read while the Tk thread writes."""
+        if threading.get_ident() == self.owner:
+            return self.conn
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            # used only by this thread, but closed by close() on the owner's
+            conn = self.local.conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self.readers_lock:
+                self.readers.append(conn)
+        return conn
+
+    def watch_paths(self):
+        # committed changes land in the WAL file first
+        return (self.path, self.path + "-wal")
+
+    def refresh(self):
+        """True if another connection committed since the last call (reads always go to the database)."""
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        changed = version != self.data_version
+        self.data_version = version
+        return changed
+
+    def all(self):
+        return self.rows_to_tasks(self.conn.execute(self.SELECT + " ORDER BY id"))
+
+    def get(self, task_id):
+        tasks = self.rows_to_tasks(self.conn.execute(self.SELECT + " WHERE id = ?", (task_id,)))
+        return tasks[0] if tasks else None
+
+    def peek_next_id(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+        highest = self.conn.execute("SELECT MAX(id) FROM tasks").fetchone()[0] or 0
+        return max(row[0] if row else 1, highest + 1)
+
+    def allocate_id(self):
+        with self.conn:
+            task_id = self.peek_next_id()
+            self.raise_next_id(task_id + 1)
+        return task_id
+
+    def raise_next_id(self, next_id):
+        self.conn.execute("INSERT INTO meta VALUES ('next_id', ?)"
+                          " ON CONFLICT (key) DO UPDATE SET value = max(value, excluded.value)", (next_id,))
+
+    def query(self, status="All", subject="All", search=""):
+        where, args = [], []
+        if status != "All":
+            where.append("status = ?")
+            args.append(status)
+        if subject != "All":
+            where.append("subject = ?")
+            args.append(subject)
+        terms = tokenize(search)
+        if search and not terms:
+            return []
+        if terms and self.fts:
+            # every term as a prefix, ANDed; bm25 weighted like searchindex.FIELD_WEIGHTS
+            match = " ".join('"%s"*' % term for term in terms)
+            sql = ("SELECT " + ", ".join("t." + c for c in self.COLUMNS + ("extra",)) +
+                   " FROM tasks_fts JOIN tasks t ON t.id = tasks_fts.rowid WHERE tasks_fts MATCH ?")
+            for clause in where:
+                sql += " AND t." + clause
+            sql += " ORDER BY bm25(tasks_fts, 3.0, 2.0, 1.0), t.id"
+            return self.rows_to_tasks(self.reader().execute(sql, [match] + args))
+        for term in terms:
+            where.append("instr(lower(title || ' ' || subject || ' ' || details), ?) > 0")
+            args.append(term)
+        sql = self.SELECT
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY due_at, priority, id"
+        return self.rows_to_tasks(self.reader().execute(sql, args))
+
+    def upcoming(self, n, today=None):
+        today = today_ordinal() if today is None else today
+        sql = self.SELECT + " WHERE due_ord >= ? AND status != 'done' ORDER BY due_ord, priority, id LIMIT ?"
+        return self.rows_to_tasks(self.reader().execute(sql, (today, n)))
+
+    def due_before(self, day, open_only=False):
+        sql = self.SELECT + " WHERE due_ord < ?"
+        if open_only:
+            sql += " AND status != 'done'"
+        sql += " ORDER BY due_ord, priority, id"
+        return self.rows_to_tasks(self.reader().execute(sql, (day,)))
+
+    def subjects(self):
+        return [r[0] for r in self.reader().execute("SELECT DISTINCT subject FROM tasks WHERE subject != '' ORDER BY subject")]
+
+    # ---------- Writing ----------
+    def put(self, task):
+        with self.conn:
+            self.conn.execute(self.INSERT, self.row_values(task))
+
+    def delete(self, task_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def write_batch(self, puts=(), deletes=(), reminder_ops=()):
+        txn = reminderlinks.new_reminder_id() if reminder_ops else None
+        with self.conn:
+            self.conn.executemany(self.INSERT, (self.row_values(t) for t in puts))
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", ((task_id,) for task_id in deletes))
+            if txn:
+                self.conn.execute("INSERT INTO reminder_txns VALUES (?, ?)", (txn, json.dumps(list(reminder_ops))))
+        if txn:
+            self.apply_reminders(txn, reminder_ops)
+
+    def apply_reminders(self, txn, ops):
+        reminderlinks.apply_ops(ops, self.reminder_path)
+        with self.conn:
+            self.conn.execute("DELETE FROM reminder_txns WHERE txn = ?", (txn,))
+
+    def recover(self):
+        for txn, ops in self.conn.execute("SELECT txn, ops FROM reminder_txns").fetchall():
+            self.apply_reminders(txn, json.loads(ops))
+
+    def compact(self):
+        """Nothing to do: SQLite has no journal of ours to fold."""
+
+    def close(self):
+        with self.readers_lock:
+            readers, self.readers = self.readers, []
+        for conn in readers:
+            conn.close()
+        self.conn.close()
+
+    # ---------- Import / export ----------
+    def import_tasks(self, tasks, next_id=0, reminder_ops=()):
+        txn = None
+        with self.conn:
+            self.conn.executemany(self.INSERT, (self.row_values(t) for t in tasks))
+            self.raise_next_id(next_id)
+            ops = list(reminder_ops)  # filled while `tasks` was consumed
+            if ops:
+                txn = reminderlinks.new_reminder_id()
+                self.conn.execute("INSERT INTO reminder_txns VALUES (?, ?)", (txn, json.dumps(ops)))
+        self.conn.execute("ANALYZE")  # let the planner pick the most selective index
+        if txn:
+            self.apply_reminders(txn, ops)
+
+    def iter_tasks(self):
+        """Every task in due-date order, streamed from the database."""
+        cursor = self.reader().execute(self.SELECT + " ORDER BY due_at, priority, id")
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            yield from self.rows_to_tasks(rows)
+
+    def import_json(self, path):
+        """Add the tasks of a homework.json-style file, keeping their IDs and next_id. Returns how many."""
+        tasks, next_id, _ = read_snapshot(path)
+        self.import_tasks(tasks, next_id)
+        return len(tasks)
+
+    def export_json(self, path):
+        """Write every task to a homework.json-style file, IDs and next_id included. Returns how many."""
+        tasks = self.all()
+        datastore.save_json(path, {"next_id": self.peek_next_id(), "tasks": tasks})
+        return len(tasks)
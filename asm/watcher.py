@@ -0,0 +1,70 @@
+"""Change notifications for the data files the sub-apps share.
+
+The Planner, Reminders and CGPA windows share the same JSON files, whether
+they run in the home page's process (see launcher.py) or in processes of
+their own. A FileWatcher checks the (mtime, size) stamp of each file it
+watches from the Tk event loop and calls back with the paths whose stamp
+moved since it last looked, so every open window follows the others
+without a Refresh button or periodic reloads. Each callback then reads
+only what changed: the task stores replay just the new journal records,
+and the reminder list is reconciled row by row.
+
+Every watcher keeps its own stamps, so a save by another window of the
+same process is reported like one from another process. A window's own
+saves are reported too; the callbacks find nothing new and are cheap.
+
+inotify is Linux-only and not in the standard library, and the app mostly
+runs on Windows, so this polls: one os.stat() per file every POLL_MS.
+"""
+import os
+
+import datastore
+
+POLL_MS = 500
+
+
+class FileWatcher:
+    def __init__(self, widget, paths, callback, interval_ms=POLL_MS):
+        self.widget = widget
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self.stamps = {p: datastore.file_stamp(p) for p in self.paths}
+        self.job = None
+        widget.bind("<Destroy>", self.on_destroy, add="+")
+        self.start()
+
+    def start(self):
+        if self.job is None:
+            self.job = self.widget.after(self.interval_ms, self.poll)
+
+    def stop(self):
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+
+    def retry(self, paths):
+        """Report these paths again on the next poll (for a callback that has to wait)."""
+        for path in paths:
+            self.stamps[path] = None
+
+    def on_destroy(self, event):
+        if event.widget is self.widget:
+            self.stop()
+
+    def changed_paths(self):
+        """Paths whose stamp moved since the last check."""
+        changed = []
+        for path in self.paths:
+            stamp = datastore.file_stamp(path)
+            if stamp != self.stamps[path]:
+                self.stamps[path] = stamp
+                changed.append(path)
+        return changed
+
+    def poll(self):
+        self.job = None
+        changed = self.changed_paths()
+        self.start()
+        if changed:
+            self.callback(changed)
@@ -0,0 +1,232 @@
+import bisect
+from tkinter import ttk
+
+
+def stable_positions(sequence):
+    """Indices of a longest increasing subsequence of `sequence` (patience sorting)."""
+    tails, tail_index, previous = [], [], [-1] * len(sequence)
+    for i, value in enumerate(sequence):
+        j = bisect.bisect_left(tails, value)
+        if j == len(tails):
+            tails.append(value)
+            tail_index.append(i)
+        else:
+            tails[j] = value
+            tail_index[j] = i
+        previous[i] = tail_index[j - 1] if j else -1
+    keep, k = set(), tail_index[-1] if tail_index else -1
+    while k != -1:
+        keep.add(k)
+        k = previous[k]
+    return keep
+
+
+class TreeReconciler:
+    """Bring a flat ttk.Treeview in line with a new row list using as few Tk calls as possible.
+
+    apply(rows) takes [(iid, values, tags), ...] in display order and diffs it
+    against what is on screen, keyed by iid: rows that vanished are deleted,
+    new rows are inserted, changed rows get one item() call, and only rows
+    outside the longest already-ordered run are moved. Unchanged rows cost
+    nothing, so the scroll position and selection are left alone.
+    `last_stats` holds the operation counts of the latest refresh.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.rendered = {}  # iid -> (values, tags) as last sent to Tk
+        self.order = []
+        self.last_stats = {"insert": 0, "update": 0, "move": 0, "delete": 0}
+
+    def apply(self, rows):
+        stats = {"insert": 0, "update": 0, "move": 0, "delete": 0}
+        wanted = {iid: (tuple(values), tuple(tags)) for iid, values, tags in rows}
+        if len(wanted) != len(rows):
+            raise ValueError("duplicate row ids")
+
+        gone = [iid for iid in self.order if iid not in wanted]
+        if gone:
+            self.tree.delete(*gone)
+            stats["delete"] = len(gone)
+            for iid in gone:
+                del self.rendered[iid]
+
+        # Rows already on screen whose relative order is kept stay where they are
+        kept = [iid for iid in self.order if iid in wanted]
+        position = {iid: i for i, iid in enumerate(kept)}
+        existing = [iid for iid, _, _ in rows if iid in position]
+        stable = {existing[i] for i in stable_positions([position[iid] for iid in existing])}
+        moving = [iid for iid in existing if iid not in stable]
+        if moving:
+            self.tree.detach(*moving)
+
+        # Children are now exactly the stable rows, in order; fill in the rest by index
+        for index, (iid, values, tags) in enumerate(rows):
+            row = wanted[iid]
+            if iid not in self.rendered:
+                self.tree.insert("", index, iid=iid, values=row[0], tags=row[1])
+                stats["insert"] += 1
+            else:
+                if iid not in stable:
+                    self.tree.move(iid, "", index)
+                    stats["move"] += 1
+                if self.rendered[iid] != row:
+                    self.tree.item(iid, values=row[0], tags=row[1])
+                    stats["update"] += 1
+            self.rendered[iid] = row
+
+        self.order = [iid for iid, _, _ in rows]
+        self.last_stats = stats
+        return stats
+
+
+class VirtualTreeview(ttk.Frame):
+    """A ttk.Treeview that only creates Tk rows for the visible part of a long list.
+
+    set_rows() takes the full list of items plus a render(item) -> (values, tags)
+    function. Only the rows in the viewport and a small buffer below it are
+    inserted into the underlying Treeview, so a redraw costs the same for
+    50 or 500,000 items. Scrolling (scrollbar, mouse wheel, arrow keys) moves
+    the window over the items. The selection is tracked by item ID, so it
+    survives scrolling and refreshes.
+
+    Row IDs are str(key(item)), like the iids of a plain Treeview.
+    """
+
+    def __init__(self, master, buffer=10, **tree_options):
+        super().__init__(master)
+        self.tree = ttk.Treeview(self, **tree_options)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.buffer = buffer
+        self.items = []
+        self.ids = []
+        self.index = {}  # row id -> position in self.items
+        self.render = None
+        self.offset = 0
+        self.visible = 20
+        self.selected = set()
+        self.shown = []  # row ids currently materialised, in order
+        self.reconciler = TreeReconciler(self.tree)
+
+        self.tree.bind("<Configure>", self.on_resize, add="+")
+        self.tree.bind("<<TreeviewSelect>>", self.on_select, add="+")
+        self.tree.bind("<MouseWheel>", self.on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self.move_focus(-1))
+        self.tree.bind("<Down>", lambda e: self.move_focus(1))
+        self.tree.bind("<Prior>", lambda e: self.move_focus(-self.visible))
+        self.tree.bind("<Next>", lambda e: self.move_focus(self.visible))
+
+    # ---------- Treeview look-alike ----------
+    def heading(self, *args, **kwargs):
+        return self.tree.heading(*args, **kwargs)
+
+    def column(self, *args, **kwargs):
+        return self.tree.column(*args, **kwargs)
+
+    def tag_configure(self, *args, **kwargs):
+        return self.tree.tag_configure(*args, **kwargs)
+
+    def bind(self, sequence=None, func=None, add=None):
+        return self.tree.bind(sequence, func, add)
+
+    def selection(self):
+        """Selected row IDs across the whole list (not just the visible rows), in list order."""
+        return tuple(sorted(self.selected, key=lambda iid: self.index.get(iid, 0)))
+
+    def selection_set(self, ids):
+        self.selected = {str(i) for i in ids if str(i) in self.index}
+        self.sync_selection()
+
+    def select_all(self):
+        """Select every row, including the ones scrolled out of view."""
+        self.selected = set(self.ids)
+        self.sync_selection()
+        self.tree.event_generate("<<TreeviewSelect>>")
+
+    # ---------- Data ----------
+    def set_rows(self, items, key, render):
+        """Replace the list. Keeps the scroll position and still-present selection."""
+        self.items = items
+        self.ids = [str(key(item)) for item in items]
+        self.index = {iid: i for i, iid in enumerate(self.ids)}
+        self.render = render
+        self.selected = {iid for iid in self.selected if iid in self.index}
+        self.offset = max(0, min(self.offset, len(self.items) - self.visible))
+        self.redraw()
+
+    def redraw(self):
+        end = min(self.offset + self.visible + self.buffer, len(self.items))
+        window = range(self.offset, end)
+        # Scrolling a few rows only deletes/inserts those rows (see TreeReconciler)
+        self.reconciler.apply([(self.ids[i], *self.render(self.items[i])) for i in window])
+        self.shown = [self.ids[i] for i in window]
+        self.tree.yview_moveto(0)
+        self.sync_selection()
+        self.update_scrollbar()
+
+    def sync_selection(self):
+        shown = [iid for iid in self.shown if iid in self.selected]
+        if set(self.tree.selection()) != set(shown):
+            self.tree.selection_set(shown)
+
+    def update_scrollbar(self):
+        total = max(len(self.items), 1)
+        first = self.offset / total
+        last = min(self.offset + self.visible, total) / total
+        self.scrollbar.set(first, last)
+
+    # ---------- Events ----------
+    def on_resize(self, event):
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, event.height // rowheight - 1)  # minus the heading
+        if visible != self.visible:
+            self.visible = visible
+            self.redraw()
+
+    def on_select(self, event=None):
+        shown = set(self.shown)
+        self.selected = (self.selected - shown) | (set(self.tree.selection()) & shown)
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.items)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.visible if args[2] == "pages" else 1)
+            self.scroll(step)
+
+    def on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def scroll(self, rows):
+        self.scroll_to(self.offset + rows)
+        return "break"
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.items) - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self.redraw()
+
+    def move_focus(self, step):
+        """Arrow/page keys: move the selection and scroll the window along with it."""
+        if not self.items:
+            return "break"
+        focus = self.tree.focus()
+        current = self.index.get(focus, self.offset)
+        target = max(0, min(current + step, len(self.items) - 1))
+        if target < self.offset:
+            self.scroll_to(target)
+        elif target >= self.offset + self.visible:
+            self.scroll_to(target - self.visible + 1)
+        iid = self.ids[target]
+        self.selected = {iid}
+        self.sync_selection()
+        self.tree.focus(iid)
+        self.tree.event_generate("<<TreeviewSelect>>")
+        return "break"
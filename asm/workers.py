@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+_executor = None
+
+
+def executor():
+    """Shared worker pool for work that must not block the Tk thread."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="asm-worker")
+    return _executor
+
+
+def run_in_background(widget, fn, *args, on_done, on_error=None, poll_ms=15):
+    """Run fn(*args) on a worker thread and hand the result back on the Tk thread.
+
+    Tk is not thread-safe, so the worker never touches widgets; instead the
+    future is polled with widget.after() and on_done(result) (or
+    on_error(exception)) is called from the event loop.
+    """
+    future = executor().submit(fn, *args)
+
+    def poll():
+        if not future.done():
+            widget.after(poll_ms, poll)
+            return
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            if on_error is None:
+                raise exc
+            on_error(exc)
+        else:
+            on_done(future.result())
+
+    widget.after(poll_ms, poll)
+    return future